@@ -12,22 +12,45 @@ we evaluate cell delay at the fixed input slew while sweeping every NLDM load
 column. The resulting CSV also carries global timing info (period/skew/setup/
 hold, clock-to-q delays) plus per-net wire resistance/capacitance and
 downstream input capacitance.
+
+By default all libs are read as one set and the first definition of a cell
+wins. With --corners the libs are grouped by PVT corner (the part of the file
+name after "__", e.g. tt_025C_1v80); each corner gets its own cells and every
+variant is characterized at every corner in one batched call. Rows then carry
+a "corner" column. Libs without a corner in their name are shared by all.
 """
 
 from __future__ import annotations
 
 import argparse
+import concurrent.futures
 import csv
+import hashlib
 import json
 import math
+import mmap
+import pickle
 import re
 import sys
+import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+import flow_trace
+from liberty_parser import parse_cells
 
 PS_TO_NS = 1e-3
 PF_TO_FF = 1e3
+LIBERTY_CACHE_VERSION = 3
+SPEF_INDEX_VERSION = 1
+COLUMNS_VERSION = 1
+LIBERTY_PARSERS = ("stream", "regex")
+OUTPUT_FORMATS = ("csv", "columns")
+CELL_HEADER_RE = re.compile(rb'cell\s*\(\s*"?([^"\s)]+)"?\s*\)\s*\{')
+CORNER_RE = re.compile(r"__((?:tt|ff|ss|fs|sf)_\w+)$")
 
 
 def clamp(value: float, lower: float, upper: float) -> float:
@@ -190,22 +213,147 @@ def parse_timing_block(block: str) -> Dict[str, object]:
     return entry
 
 
+def axis_weights(axes: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Vectorized find_interval() for a stack of axes.
+
+    axes is (T, n) and values (T, P); returns lower/upper breakpoint indices
+    and interpolation weights, each (T, P). searchsorted(side="left") on each
+    axis row picks the same interval as find_interval() when a value sits
+    exactly on a breakpoint.
+    """
+    size = axes.shape[1]
+    if size == 1:
+        zero = np.zeros(values.shape, dtype=np.intp)
+        return zero, zero, np.zeros(values.shape)
+    values = np.clip(values, axes[:, :1], axes[:, -1:])
+    above = np.stack([np.searchsorted(axis, row, side="left") for axis, row in zip(axes, values)])
+    low = np.clip(above - 1, 0, size - 2)
+    low_val = np.take_along_axis(axes, low, axis=1)
+    span = np.take_along_axis(axes, low + 1, axis=1) - low_val
+    weight = np.divide(values - low_val, span, out=np.zeros(values.shape), where=span != 0)
+    return low, low + 1, weight
+
+
+def interpolate_tables(
+    index_1: np.ndarray, index_2: np.ndarray, values: np.ndarray, x: np.ndarray, y: np.ndarray
+) -> np.ndarray:
+    """Bilinear lookup of (T, P) points in T stacked tables of equal shape.
+
+    index_1 is (T, n1), index_2 (T, n2), values (T, n1, n2). The arithmetic
+    mirrors bilinear() term for term so results match it bit for bit.
+    """
+    i1, i2, tx = axis_weights(index_1, x)
+    j1, j2, ty = axis_weights(index_2, y)
+    table = np.arange(values.shape[0])[:, None]
+    q11 = values[table, i1, j1]
+    q12 = values[table, i1, j2]
+    q21 = values[table, i2, j1]
+    q22 = values[table, i2, j2]
+    r1 = q11 + (q12 - q11) * ty
+    r2 = q21 + (q22 - q21) * ty
+    return r1 + (r2 - r1) * tx
+
+
+class NldmTable:
+    """An NLDM timing table compiled to NumPy arrays."""
+
+    __slots__ = ("index_1", "index_2", "values")
+
+    def __init__(self, table: Dict[str, List]) -> None:
+        self.index_1 = np.asarray(table.get("index_1", []), dtype=float)
+        self.index_2 = np.asarray(table.get("index_2", []), dtype=float)
+        values = table.get("values", [])
+        if not self.index_1.size or not self.index_2.size or not values:
+            raise ValueError("Incomplete timing table")
+        self.values = np.asarray(values, dtype=float).reshape(self.index_1.size, self.index_2.size)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.values.shape
+
+    def evaluate(self, x, y) -> np.ndarray:
+        """Interpolate at broadcastable arrays of index_1 / index_2 points."""
+        x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+        result = interpolate_tables(
+            self.index_1[None, :],
+            self.index_2[None, :],
+            self.values[None, :, :],
+            x.reshape(1, -1),
+            y.reshape(1, -1),
+        )
+        return result.reshape(x.shape)
+
+
+def evaluate_stack(tables: Sequence[NldmTable], x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Evaluate T tables at (T, P) points in one array call.
+
+    Tables of differing shape (rare within a family) fall back to one call
+    per table.
+    """
+    if len({table.shape for table in tables}) > 1:
+        return np.stack([table.evaluate(x[idx], y[idx]) for idx, table in enumerate(tables)])
+    return interpolate_tables(
+        np.stack([table.index_1 for table in tables]),
+        np.stack([table.index_2 for table in tables]),
+        np.stack([table.values for table in tables]),
+        x,
+        y,
+    )
+
+
 @dataclass
 class TimingArc:
     related_pin: str
     cell_rise: Optional[Dict[str, List]]
     cell_fall: Optional[Dict[str, List]]
 
-    def delay_ps(self, slew_ps: float, load_pf: float) -> float:
-        slew_ns = slew_ps * PS_TO_NS
-        delays: List[float] = []
-        if self.cell_rise:
-            delays.append(bilinear(self.cell_rise, slew_ns, load_pf))
-        if self.cell_fall:
-            delays.append(bilinear(self.cell_fall, slew_ns, load_pf))
-        if not delays:
+    def __post_init__(self) -> None:
+        self.tables: List[NldmTable] = []
+        for table in (self.cell_rise, self.cell_fall):
+            if table:
+                try:
+                    self.tables.append(NldmTable(table))
+                except ValueError:
+                    self.tables = []
+                    break
+
+    def delay_ps_batch(self, slew_ps, load_pf) -> np.ndarray:
+        """Worst of rise/fall delay (ps) at broadcastable slew (ps) / load (pF) arrays."""
+        if not self.tables:
             raise ValueError("Timing arc has no rise/fall tables.")
-        return max(delays) * 1e3  # convert ns to ps
+        slew_ns = np.asarray(slew_ps, dtype=float) * PS_TO_NS
+        delays = [table.evaluate(slew_ns, load_pf) for table in self.tables]
+        return np.maximum.reduce(delays) * 1e3  # convert ns to ps
+
+    def delay_ps(self, slew_ps: float, load_pf: float) -> float:
+        return float(self.delay_ps_batch(slew_ps, load_pf))
+
+
+def family_delay_ps(arcs: Sequence[TimingArc], slew_ps, load_pf) -> np.ndarray:
+    """Characterize a family's arcs over a (variant, point) grid in one array call.
+
+    slew_ps / load_pf broadcast to (len(arcs), P), e.g. one slew per variant
+    as a column and each variant's load axis as a row. Rise and fall tables
+    of every arc are stacked and interpolated together; the worse of the two
+    is returned in ps.
+    """
+    slew_ps, load_pf = np.broadcast_arrays(
+        np.atleast_2d(np.asarray(slew_ps, dtype=float)), np.atleast_2d(np.asarray(load_pf, dtype=float))
+    )
+    shape = (len(arcs), slew_ps.shape[1])
+    slew_ps = np.broadcast_to(slew_ps, shape)
+    load_pf = np.broadcast_to(load_pf, shape)
+    per_arc = {len(arc.tables) for arc in arcs}
+    if len(per_arc) != 1 or 0 in per_arc:
+        return np.stack([arc.delay_ps_batch(slew_ps[idx], load_pf[idx]) for idx, arc in enumerate(arcs)])
+    count = per_arc.pop()
+    tables = [table for arc in arcs for table in arc.tables]
+    delays = evaluate_stack(
+        tables,
+        np.repeat(slew_ps * PS_TO_NS, count, axis=0),
+        np.repeat(load_pf, count, axis=0),
+    )
+    return delays.reshape(len(arcs), count, -1).max(axis=1) * 1e3  # convert ns to ps
 
 
 class LibertyCell:
@@ -213,6 +361,17 @@ class LibertyCell:
         self.name = name
         self.pins = pins
         self.area = area
+        # Delay arcs with their NLDM tables compiled once, when the cell is loaded.
+        self._arcs: Dict[Tuple[str, str], TimingArc] = {}
+        for pin_name, pin in pins.items():
+            for timing in pin.get("timing", []):
+                related_pin = timing.get("related_pin")
+                if timing.get("cell_rise") and (related_pin, pin_name) not in self._arcs:
+                    self._arcs[(related_pin, pin_name)] = TimingArc(
+                        related_pin=related_pin,
+                        cell_rise=timing.get("cell_rise"),
+                        cell_fall=timing.get("cell_fall"),
+                    )
 
     def get_pin_cap(self, pin_name: str) -> Optional[float]:
         pin = self.pins.get(pin_name)
@@ -225,22 +384,239 @@ class LibertyCell:
         pin = self.pins.get(to_pin)
         if not pin:
             raise KeyError(f"{self.name} has no pin '{to_pin}'")
-        for timing in pin.get("timing", []):
-            if timing.get("related_pin") == from_pin and timing.get("cell_rise"):
-                return TimingArc(
-                    related_pin=from_pin,
-                    cell_rise=timing.get("cell_rise"),
-                    cell_fall=timing.get("cell_fall"),
-                )
-        raise KeyError(f"No timing arc {from_pin}->{to_pin} found in {self.name}")
+        arc = self._arcs.get((from_pin, to_pin))
+        if arc is None:
+            raise KeyError(f"No timing arc {from_pin}->{to_pin} found in {self.name}")
+        return arc
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class LibertyCache:
+    """On-disk pickle of parsed liberty data, keyed by the ordered lib file set.
+
+    Each entry records path, size, mtime and SHA-256 of every lib. Size and
+    mtime are checked first; only when they differ is the file re-hashed, so a
+    touched but unchanged lib keeps its entry while any edit invalidates it.
+    `kind` separates what was stored: full cells per parser, or the lazy
+    cell offset index.
+    """
+
+    def __init__(self, cache_dir: Path) -> None:
+        self.cache_dir = cache_dir
+
+    def entry_path(self, lib_paths: Sequence[Path], kind: str) -> Path:
+        key = "\n".join([kind] + [str(path.resolve()) for path in lib_paths])
+        return self.cache_dir / f"liberty_{hashlib.sha256(key.encode()).hexdigest()[:24]}.pkl"
+
+    def load(self, lib_paths: Sequence[Path], kind: str) -> Optional[object]:
+        entry_path = self.entry_path(lib_paths, kind)
+        try:
+            with entry_path.open("rb") as fh:
+                payload = pickle.load(fh)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            return None
+        if not isinstance(payload, dict) or payload.get("version") != LIBERTY_CACHE_VERSION:
+            return None
+        if payload.get("kind") != kind:
+            return None
+        files = payload.get("files", [])
+        if len(files) != len(lib_paths):
+            return None
+        refreshed = False
+        for lib_path, entry in zip(lib_paths, files):
+            stat = lib_path.stat()
+            if entry["path"] != str(lib_path.resolve()) or entry["size"] != stat.st_size:
+                return None
+            if entry["mtime_ns"] == stat.st_mtime_ns:
+                continue
+            if file_sha256(lib_path) != entry["sha256"]:
+                return None
+            entry["mtime_ns"] = stat.st_mtime_ns
+            refreshed = True
+        if refreshed:
+            self._write(entry_path, payload)
+        return payload["data"]
+
+    def store(self, lib_paths: Sequence[Path], kind: str, data: object) -> None:
+        files = []
+        for lib_path in lib_paths:
+            stat = lib_path.stat()
+            files.append(
+                {
+                    "path": str(lib_path.resolve()),
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "sha256": file_sha256(lib_path),
+                }
+            )
+        payload = {
+            "version": LIBERTY_CACHE_VERSION,
+            "kind": kind,
+            "files": files,
+            "data": data,
+        }
+        self._write(self.entry_path(lib_paths, kind), payload)
+
+    def _write(self, entry_path: Path, payload: Dict[str, object]) -> None:
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = entry_path.with_suffix(".tmp")
+            with tmp_path.open("wb") as fh:
+                pickle.dump(payload, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            tmp_path.replace(entry_path)
+        except OSError as exc:
+            print(f"[WARN] Could not write liberty cache {entry_path}: {exc}", file=sys.stderr)
+
+
+def index_cells(buf) -> Dict[str, int]:
+    """Map each cell name in a liberty buffer to the byte offset of its group."""
+    offsets: Dict[str, int] = {}
+    for match in CELL_HEADER_RE.finditer(buf):
+        start = match.start()
+        # Checked here rather than with a lookbehind, which defeats the regex
+        # engine's literal prefix search and makes the scan several times slower.
+        if start and (buf[start - 1 : start].isalnum() or buf[start - 1 : start] == b"_"):
+            continue
+        offsets.setdefault(match.group(1).decode("latin-1"), start)
+    return offsets
+
+
+def parse_cell_batch(
+    lib_path: Path, offsets: Sequence[int]
+) -> List[Tuple[str, Dict[str, Dict[str, object]], Optional[float]]]:
+    """Parse the cell groups starting at `offsets` in one lib (process pool worker)."""
+    parsed = []
+    with lib_path.open("rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        for offset in offsets:
+            for cell_name, (pins, area) in parse_cells(buf, start=offset, limit=1).items():
+                parsed.append((cell_name, pins, area))
+    return parsed
 
 
 class LibertyDatabase:
-    def __init__(self, lib_paths: Sequence[Path]) -> None:
+    """Cells from a set of liberty files; the first definition of a name wins.
+
+    With lazy=True only the byte offset of every cell group is recorded when
+    the libs are opened (files are mmapped, not read). Pins and timing tables
+    of a cell are parsed the first time get_cell() asks for it.
+
+    With jobs > 1 the libs are indexed first, and only the winning definition
+    of each cell is parsed, in batches spread over a process pool.
+    """
+
+    def __init__(
+        self,
+        lib_paths: Sequence[Path],
+        cache_dir: Optional[Path] = None,
+        parser: str = "stream",
+        lazy: bool = False,
+        jobs: int = 1,
+    ) -> None:
         if not lib_paths:
             raise ValueError("No liberty files provided.")
+        if parser not in LIBERTY_PARSERS:
+            raise ValueError(f"Unknown liberty parser '{parser}'")
+        if lazy and parser != "stream":
+            raise ValueError("Lazy liberty loading requires the stream parser.")
+        if jobs > 1 and parser != "stream":
+            raise ValueError("Parallel liberty parsing requires the stream parser.")
+        lib_paths = list(lib_paths)
+        start = time.perf_counter()
+        self.lib_paths = lib_paths
         self.cells: Dict[str, LibertyCell] = {}
         self.family_map: Dict[str, List[Tuple[Optional[int], str]]] = {}
+        self.lazy = lazy
+        self.cache_hit = False
+        # Lazy mode: cell name -> (index into lib_paths, byte offset of its group).
+        self._offsets: Dict[str, Tuple[int, int]] = {}
+        self._buffers: Dict[int, mmap.mmap] = {}
+        cache = LibertyCache(cache_dir) if cache_dir is not None else None
+        kind = "index" if lazy else parser
+        cached = cache.load(lib_paths, kind) if cache else None
+        if cached is not None:
+            if lazy:
+                self._offsets = cached
+            else:
+                for cell_name, (pins, area) in cached.items():
+                    self.cells[cell_name] = LibertyCell(cell_name, pins, area)
+            self.cache_hit = True
+        else:
+            if lazy:
+                self._index_files(lib_paths)
+            elif jobs > 1:
+                self._parse_parallel(lib_paths, jobs)
+            elif parser == "stream":
+                self._stream_files(lib_paths)
+            else:
+                self._parse_files(lib_paths)
+            if cache:
+                data = (
+                    self._offsets
+                    if lazy
+                    else {name: (cell.pins, cell.area) for name, cell in self.cells.items()}
+                )
+                cache.store(lib_paths, kind, data)
+        for cell_name in self.cell_names():
+            base, strength = split_cell_family(cell_name)
+            self.family_map.setdefault(base, []).append((strength, cell_name))
+        for variants in self.family_map.values():
+            variants.sort(key=lambda item: ((item[0] is None), item[0] or -1, item[1]))
+        self.num_files = len(lib_paths)
+        self.load_seconds = time.perf_counter() - start
+
+    def _index_files(self, lib_paths: Sequence[Path]) -> None:
+        for file_idx, lib_path in enumerate(lib_paths):
+            for cell_name, offset in index_cells(self._buffer(file_idx)).items():
+                self._offsets.setdefault(cell_name, (file_idx, offset))
+
+    def _parse_parallel(self, lib_paths: Sequence[Path], jobs: int) -> None:
+        self._index_files(lib_paths)
+        per_file: Dict[int, List[int]] = {}
+        order: List[str] = list(self._offsets)
+        for file_idx, offset in self._offsets.values():
+            per_file.setdefault(file_idx, []).append(offset)
+        # A few batches per worker keeps the pool busy when files differ in size.
+        batch_size = max(1, len(order) // (jobs * 4))
+        batches = []
+        for file_idx, offsets in sorted(per_file.items()):
+            offsets.sort()
+            for idx in range(0, len(offsets), batch_size):
+                batches.append((lib_paths[file_idx], offsets[idx : idx + batch_size]))
+        self.close()
+        parsed: Dict[str, LibertyCell] = {}
+        with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(parse_cell_batch, path, offsets) for path, offsets in batches]
+            for future in futures:
+                for cell_name, pins, area in future.result():
+                    parsed[cell_name] = LibertyCell(cell_name, pins, area)
+        # Keep index (first-wins) order so the result matches a serial parse.
+        for cell_name in order:
+            if cell_name in parsed:
+                self.cells[cell_name] = parsed[cell_name]
+        self._offsets = {}
+
+    def _buffer(self, file_idx: int) -> mmap.mmap:
+        buf = self._buffers.get(file_idx)
+        if buf is None:
+            with self.lib_paths[file_idx].open("rb") as fh:
+                buf = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            self._buffers[file_idx] = buf
+        return buf
+
+    def _stream_files(self, lib_paths: Sequence[Path]) -> None:
+        for lib_path in lib_paths:
+            cells = parse_cells(lib_path.read_bytes(), skip=self.cells)
+            for cell_name, (pins, area) in cells.items():
+                self.cells[cell_name] = LibertyCell(cell_name, pins, area)
+
+    def _parse_files(self, lib_paths: Sequence[Path]) -> None:
         for lib_path in lib_paths:
             text = lib_path.read_text()
             for match in re.finditer(r'cell\s*\(\s*"([^"]+)"\s*\)\s*{', text):
@@ -254,31 +630,161 @@ class LibertyDatabase:
                 pins = parse_pins(block)
                 area = parse_area(block)
                 self.cells[cell_name] = LibertyCell(cell_name, pins, area)
-        for cell_name in self.cells:
-            base, strength = split_cell_family(cell_name)
-            self.family_map.setdefault(base, []).append((strength, cell_name))
-        for variants in self.family_map.values():
-            variants.sort(key=lambda item: ((item[0] is None), item[0] or -1, item[1]))
+
+    def cell_names(self) -> List[str]:
+        if self.lazy:
+            return list(self._offsets)
+        return list(self.cells)
+
+    def has_cell(self, name: str) -> bool:
+        return name in self.cells or name in self._offsets
+
+    def load_summary(self) -> str:
+        source = "cache hit" if self.cache_hit else "cold parse"
+        if self.lazy:
+            source += ", lazy index"
+        return (
+            f"Loaded {len(self.cell_names())} liberty cells from {self.num_files} file(s) "
+            f"in {self.load_seconds * 1e3:.1f} ms ({source})"
+        )
 
     def get_cell(self, name: str) -> Optional[LibertyCell]:
-        return self.cells.get(name)
+        cell = self.cells.get(name)
+        if cell is None and name in self._offsets:
+            file_idx, offset = self._offsets[name]
+            parsed = parse_cells(self._buffer(file_idx), start=offset, limit=1)
+            if name in parsed:
+                pins, area = parsed[name]
+                cell = LibertyCell(name, pins, area)
+                self.cells[name] = cell
+        return cell
 
     def family_variants(self, cell_name: str) -> List[str]:
         base, _ = split_cell_family(cell_name)
         entries = self.family_map.get(base, [])
-        if not entries and cell_name in self.cells:
+        if not entries and self.has_cell(cell_name):
             return [cell_name]
         return [name for _, name in entries]
 
+    def close(self) -> None:
+        for buf in self._buffers.values():
+            buf.close()
+        self._buffers.clear()
 
-class SpefParser:
-    """Minimal SPEF parser for wire RC + pin caps."""
 
-    def __init__(self, spef_path: Path) -> None:
-        self.lines = spef_path.read_text().splitlines()
+class SpefParser:
+    """Minimal SPEF parser for wire RC + pin caps.
+
+    The file is read line by line. When `nets` is given, only those nets are
+    materialized: the *D_NET header is resolved through *NAME_MAP and any
+    other net's section is skipped up to its *END without being split, and
+    reading stops once every requested net has been seen.
+
+    With use_index=True a sidecar `<spef>.idx` maps every resolved net name
+    to the byte offset of its *D_NET line (plus the *NAME_MAP span). It is
+    built on the first pass and reused while the SPEF's size and mtime are
+    unchanged; net_info() then seeks straight to a net and parses only that
+    block.
+    """
+
+    def __init__(
+        self,
+        spef_path: Path,
+        nets: Optional[Iterable[str]] = None,
+        use_index: bool = False,
+    ) -> None:
+        self.spef_path = spef_path
         self.name_map: Dict[str, str] = {}
         self.net_data: Dict[str, Dict[str, object]] = {}
-        self._parse()
+        self.wanted = set(nets) if nets is not None else None
+        self.net_offsets: Optional[Dict[str, int]] = None
+        self.index_loaded = False
+        if use_index:
+            self._open_index()
+            for net_name in sorted(self.wanted or ()):
+                self.net_info(net_name)
+            return
+        with spef_path.open() as fh:
+            self._parse(fh)
+
+    @property
+    def index_path(self) -> Path:
+        return self.spef_path.with_name(self.spef_path.name + ".idx")
+
+    def _open_index(self) -> None:
+        stat = self.spef_path.stat()
+        try:
+            with self.index_path.open() as fh:
+                index = json.load(fh)
+        except (OSError, ValueError):
+            index = None
+        if (
+            isinstance(index, dict)
+            and index.get("version") == SPEF_INDEX_VERSION
+            and index.get("size") == stat.st_size
+            and index.get("mtime_ns") == stat.st_mtime_ns
+        ):
+            self.net_offsets = index["nets"]
+            start, end = index["name_map"]
+            with self.spef_path.open("rb") as fh:
+                fh.seek(start)
+                for entry in fh.read(end - start).decode().splitlines():
+                    self._add_name(entry.strip())
+            self.index_loaded = True
+            return
+        self._build_index(stat)
+
+    def _build_index(self, stat) -> None:
+        offsets: Dict[str, int] = {}
+        name_map_span = [0, 0]
+        in_name_map = False
+        pos = 0
+        with self.spef_path.open("rb") as fh:
+            for raw in fh:
+                line = raw.strip()
+                if in_name_map:
+                    if not line or line.startswith(b"*D_NET"):
+                        in_name_map = False
+                        name_map_span[1] = pos
+                    else:
+                        self._add_name(line.decode())
+                elif line.startswith(b"*NAME_MAP") and not self.name_map:
+                    in_name_map = True
+                    name_map_span = [pos + len(raw), pos + len(raw)]
+                if line.startswith(b"*D_NET"):
+                    offsets[self._resolve(line.split()[1].decode())] = pos
+                pos += len(raw)
+        if in_name_map:
+            name_map_span[1] = pos
+        self.net_offsets = offsets
+        index = {
+            "version": SPEF_INDEX_VERSION,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "name_map": name_map_span,
+            "nets": offsets,
+        }
+        try:
+            tmp_path = self.index_path.with_suffix(".idx.tmp")
+            with tmp_path.open("w") as fh:
+                json.dump(index, fh)
+            tmp_path.replace(self.index_path)
+        except OSError as exc:
+            print(f"[WARN] Could not write SPEF index {self.index_path}: {exc}", file=sys.stderr)
+
+    def _read_net_at(self, offset: int) -> Dict[str, object]:
+        with self.spef_path.open("rb") as fh:
+            fh.seek(offset)
+            lines = (raw.decode() for raw in fh)
+            header = next(lines).split()
+            return self._parse_net(float(header[2]), lines)
+
+    def _add_name(self, entry: str) -> None:
+        if entry.startswith("*"):
+            parts = entry.split(None, 1)
+            if len(parts) == 2:
+                idx = parts[0][1:]
+                self.name_map[idx] = parts[1].strip().replace("\\", "")
 
     def _resolve(self, token: str) -> str:
         token = token.strip()
@@ -290,84 +796,88 @@ class SpefParser:
             return self.name_map.get(body, "")
         return token.replace("\\", "")
 
-    def _parse(self) -> None:
-        i = 0
-        n = len(self.lines)
-        while i < n:
-            line = self.lines[i].strip()
+    def _parse(self, lines: Iterable[str]) -> None:
+        lines = iter(lines)
+        wanted = self.wanted
+        line = next(lines, None)
+        while line is not None:
+            line = line.strip()
             if not line:
-                i += 1
+                line = next(lines, None)
                 continue
             if line.startswith("*NAME_MAP"):
-                i += 1
-                while i < n:
-                    entry = self.lines[i].strip()
+                line = next(lines, None)
+                while line is not None:
+                    entry = line.strip()
                     if entry.startswith("*D_NET") or not entry:
                         break
-                    if entry.startswith("*"):
-                        parts = entry.split(None, 1)
-                        if len(parts) == 2:
-                            idx = parts[0][1:]
-                            self.name_map[idx] = parts[1].strip().replace("\\", "")
-                    i += 1
+                    self._add_name(entry)
+                    line = next(lines, None)
                 continue
             if line.startswith("*D_NET"):
                 parts = line.split()
                 net_name = self._resolve(parts[1])
-                total_cap = float(parts[2])
-                i += 1
-                conn_nodes: set[str] = set()
-                pin_caps: Dict[str, float] = {}
-                wire_cap = 0.0
-                total_res = 0.0
-                section = None
-                while i < n:
-                    entry = self.lines[i].strip()
-                    if entry.startswith("*CONN"):
-                        section = "CONN"
-                        i += 1
-                        continue
-                    if entry.startswith("*CAP"):
-                        section = "CAP"
-                        i += 1
-                        continue
-                    if entry.startswith("*RES"):
-                        section = "RES"
-                        i += 1
-                        continue
-                    if entry.startswith("*END"):
-                        i += 1
-                        break
-                    if section == "CONN":
-                        parts = entry.split()
-                        if len(parts) >= 2:
-                            conn_nodes.add(self._resolve(parts[1]))
-                    elif section == "CAP":
-                        parts = entry.split()
-                        if len(parts) == 3:
-                            node = self._resolve(parts[1])
-                            val = float(parts[2])
-                            if node in conn_nodes:
-                                pin_caps[node] = pin_caps.get(node, 0.0) + val
-                            else:
-                                wire_cap += val
-                        elif len(parts) == 4:
-                            wire_cap += float(parts[3])
-                    elif section == "RES":
-                        parts = entry.split()
-                        if len(parts) >= 4:
-                            total_res += float(parts[3])
-                    i += 1
-                self.net_data[net_name] = {
-                    "total_cap": total_cap,
-                    "wire_cap_pf": wire_cap,
-                    "pin_caps": pin_caps,
-                    "wire_res_ohm": total_res,
-                }
+                if wanted is not None and net_name not in wanted:
+                    for line in lines:
+                        if line.lstrip().startswith("*END"):
+                            break
+                    line = next(lines, None)
+                    continue
+                self.net_data[net_name] = self._parse_net(float(parts[2]), lines)
+                if wanted is not None and wanted.issubset(self.net_data):
+                    break
+                line = next(lines, None)
+                continue
+            line = next(lines, None)
+
+    def _parse_net(self, total_cap: float, lines: Iterator[str]) -> Dict[str, object]:
+        conn_nodes: set[str] = set()
+        pin_caps: Dict[str, float] = {}
+        wire_cap = 0.0
+        total_res = 0.0
+        section = None
+        for line in lines:
+            entry = line.strip()
+            if entry.startswith("*CONN"):
+                section = "CONN"
                 continue
-            i += 1
+            if entry.startswith("*CAP"):
+                section = "CAP"
+                continue
+            if entry.startswith("*RES"):
+                section = "RES"
+                continue
+            if entry.startswith("*END"):
+                break
+            if section == "CONN":
+                parts = entry.split()
+                if len(parts) >= 2:
+                    conn_nodes.add(self._resolve(parts[1]))
+            elif section == "CAP":
+                parts = entry.split()
+                if len(parts) == 3:
+                    node = self._resolve(parts[1])
+                    val = float(parts[2])
+                    if node in conn_nodes:
+                        pin_caps[node] = pin_caps.get(node, 0.0) + val
+                    else:
+                        wire_cap += val
+                elif len(parts) == 4:
+                    wire_cap += float(parts[3])
+            elif section == "RES":
+                parts = entry.split()
+                if len(parts) >= 4:
+                    total_res += float(parts[3])
+        return {
+            "total_cap": total_cap,
+            "wire_cap_pf": wire_cap,
+            "pin_caps": pin_caps,
+            "wire_res_ohm": total_res,
+        }
 
     def net_info(self, net_name: str) -> Dict[str, object]:
+        if self.net_offsets is not None and net_name not in self.net_data and net_name in self.net_offsets:
+            self.net_data[net_name] = self._read_net_at(self.net_offsets[net_name])
         return self.net_data.get(
             net_name,
             {"total_cap": 0.0, "wire_cap_pf": 0.0, "pin_caps": {}, "wire_res_ohm": 0.0},
@@ -381,6 +891,31 @@ def split_cell_family(cell_name: str) -> Tuple[str, Optional[int]]:
     return cell_name, None
 
 
+def corner_of(lib_path: Path) -> Optional[str]:
+    """PVT corner in a liberty file name, e.g. tt_025C_1v80; None if it has none."""
+    match = CORNER_RE.search(lib_path.stem)
+    return match.group(1) if match else None
+
+
+def group_corners(lib_paths: Sequence[Path], names: Optional[Sequence[str]] = None) -> Dict[str, List[Path]]:
+    """Lib files per corner; corner-less libs follow each corner's own files.
+
+    Without names every corner found is returned, typical (tt) corners first.
+    """
+    shared = [path for path in lib_paths if corner_of(path) is None]
+    found: Dict[str, List[Path]] = {}
+    for path in lib_paths:
+        corner = corner_of(path)
+        if corner is not None:
+            found.setdefault(corner, []).append(path)
+    if names is None:
+        names = sorted(found, key=lambda name: (not name.startswith("tt"), name))
+    missing = [name for name in names if name not in found]
+    if missing:
+        raise ValueError(f"No liberty files for corner(s) {', '.join(missing)}; found {', '.join(sorted(found))}")
+    return {name: found[name] + shared for name in names}
+
+
 def as_float(value) -> Optional[float]:
     if value in ("", None):
         return None
@@ -390,35 +925,93 @@ def as_float(value) -> Optional[float]:
         return None
 
 
-def stage_variants(stage: Dict[str, object], libdb: LibertyDatabase) -> List[Tuple[str, float, float]]:
+def stage_arcs(
+    stage: Dict[str, object], libdb: LibertyDatabase
+) -> Tuple[List[str], List[TimingArc], List[List[float]]]:
+    """Variants of the stage's family with a usable arc: (names, arcs, load axes in pF)."""
     input_pin_full = stage.get("input_pin") or ""
     driver_pin = stage.get("driver_pin_name") or ""
     input_pin_name = input_pin_full.split("/")[-1] if input_pin_full else ""
     driver_pin_name = str(driver_pin)
+    names: List[str] = []
+    arcs: List[TimingArc] = []
+    loads: List[List[float]] = []
     if not input_pin_name or not driver_pin_name:
-        return []
+        return names, arcs, loads
     cell_name = str(stage.get("cell") or "")
-    stage_slew_ps = as_float(stage.get("input_slew_ps")) or 0.0
-    variants = libdb.family_variants(cell_name)
-    data: List[Tuple[str, float, float]] = []
-    for variant in variants:
+    for variant in libdb.family_variants(cell_name):
         cell = libdb.get_cell(variant)
         if not cell:
             continue
         try:
             arc = cell.find_timing_arc(input_pin_name, driver_pin_name)
-            load_table = arc.cell_rise or arc.cell_fall
-            if not load_table:
-                continue
-            loads_pf = load_table.get("index_2", [])
-            for load_pf in loads_pf:
-                delay_ps = arc.delay_ps(stage_slew_ps, load_pf)
-                data.append((variant, load_pf, delay_ps))
-        except (KeyError, ValueError):
+        except KeyError:
             continue
+        load_table = arc.cell_rise or arc.cell_fall
+        loads_pf = load_table.get("index_2", []) if load_table else []
+        if not arc.tables or not loads_pf:
+            continue
+        names.append(variant)
+        arcs.append(arc)
+        loads.append(loads_pf)
+    return names, arcs, loads
+
+
+def arcs_delay_ps(arcs: Sequence[TimingArc], slew_ps: float, loads: Sequence[List[float]]) -> List[List[float]]:
+    if len({len(loads_pf) for loads_pf in loads}) == 1:
+        # Each arc's own load axis forms one row of a (arc, load) grid.
+        return family_delay_ps(arcs, slew_ps, loads).tolist()
+    return [arc.delay_ps_batch(slew_ps, loads_pf).tolist() for arc, loads_pf in zip(arcs, loads)]
+
+
+def stage_variants(stage: Dict[str, object], libdb: LibertyDatabase) -> List[Tuple[str, float, float]]:
+    names, arcs, loads = stage_arcs(stage, libdb)
+    if not arcs:
+        return []
+    stage_slew_ps = as_float(stage.get("input_slew_ps")) or 0.0
+    delays = arcs_delay_ps(arcs, stage_slew_ps, loads)
+    data: List[Tuple[str, float, float]] = []
+    for variant, loads_pf, variant_delays in zip(names, loads, delays):
+        for load_pf, delay_ps in zip(loads_pf, variant_delays):
+            data.append((variant, load_pf, delay_ps))
+    return data
+
+
+def corner_stage_variants(
+    stage: Dict[str, object], corners: Dict[str, LibertyDatabase]
+) -> List[Tuple[str, str, float, float]]:
+    """stage_variants() at every corner: (corner, variant, load_pf, delay_ps) tuples.
+
+    Only variants characterized at every corner are kept. The arcs of all
+    corners go through family_delay_ps() together, so the family is evaluated
+    in one array call rather than once per corner.
+    """
+    per_corner = {corner: stage_arcs(stage, libdb) for corner, libdb in corners.items()}
+    common = set.intersection(*(set(names) for names, _, _ in per_corner.values()))
+    keys: List[Tuple[str, str]] = []
+    arcs: List[TimingArc] = []
+    loads: List[List[float]] = []
+    for corner, (names, corner_arcs, corner_loads) in per_corner.items():
+        for variant, arc, loads_pf in zip(names, corner_arcs, corner_loads):
+            if variant in common:
+                keys.append((corner, variant))
+                arcs.append(arc)
+                loads.append(loads_pf)
+    if not arcs:
+        return []
+    stage_slew_ps = as_float(stage.get("input_slew_ps")) or 0.0
+    delays = arcs_delay_ps(arcs, stage_slew_ps, loads)
+    data: List[Tuple[str, str, float, float]] = []
+    for (corner, variant), loads_pf, variant_delays in zip(keys, loads, delays):
+        for load_pf, delay_ps in zip(loads_pf, variant_delays):
+            data.append((corner, variant, load_pf, delay_ps))
     return data
 
 
+def stage_nets(stages: Sequence[Dict[str, object]]) -> List[str]:
+    return [str(stage.get("net") or "") for stage in stages if stage.get("net")]
+
+
 def load_json(path: Path) -> Dict[str, object]:
     with path.open() as fh:
         return json.load(fh)
@@ -462,6 +1055,8 @@ def write_csv(rows: List[Dict[str, object]], out_path: Path) -> None:
         "clock_period_ps_and_freq",
         "global_slack_ps",
     ]
+    if rows and "corner" in rows[0]:
+        fieldnames.insert(fieldnames.index("variant_cell") + 1, "corner")
     out_path.parent.mkdir(parents=True, exist_ok=True)
     with out_path.open("w", newline="") as fh:
         writer = csv.DictWriter(fh, fieldnames=fieldnames)
@@ -470,12 +1065,108 @@ def write_csv(rows: List[Dict[str, object]], out_path: Path) -> None:
             writer.writerow(row)
 
 
+# Columnar variant data: path-level values once in meta.json, one stage record
+# per gate, and the per-load sweep as a structured array in rows.npy that
+# readers can memory-map.
+COLUMNS_TIMING_FIELDS = (
+    "global_T_period_ps",
+    "global_T_skew_ps",
+    "global_T_setup_ps",
+    "global_T_hold_ps",
+    "t_clk_q_max_ps",
+    "t_clk_q_min_ps",
+    "clock_period_ps_and_freq",
+    "global_slack_ps",
+)
+COLUMNS_STAGE_FIELDS = (
+    "gate_index",
+    "instance_name",
+    "original_cell",
+    "fixed_input_slew_ps",
+    "wire_resistance_ohm",
+    "wire_capacitance_fF",
+    "downstream_input_cap_fF",
+)
+COLUMNS_ROW_DTYPE = np.dtype(
+    [
+        ("stage", "<i4"),
+        ("variant", "<i4"),
+        ("output_capacitance_fF", "<f8"),
+        ("cell_delay_ps", "<f8"),
+        ("variant_area_um2", "<f8"),
+    ]
+)
+
+
+def write_columns(rows: List[Dict[str, object]], out_dir: Path) -> None:
+    """Write build_rows() output in the columnar form read by read_columns()."""
+    if rows and "corner" in rows[0]:
+        raise ValueError("The columnar format holds one corner; write multi-corner rows as CSV.")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    first_rows: Dict[object, Dict[str, object]] = {}
+    for row in rows:
+        first_rows.setdefault(row["gate_index"], row)
+    gates = sorted(first_rows)
+    stage_pos = {gate: pos for pos, gate in enumerate(gates)}
+    variant_names = sorted({str(row["variant_cell"]) for row in rows})
+    variant_pos = {name: pos for pos, name in enumerate(variant_names)}
+
+    table = np.empty(len(rows), dtype=COLUMNS_ROW_DTYPE)
+    table["stage"] = [stage_pos[row["gate_index"]] for row in rows]
+    table["variant"] = [variant_pos[str(row["variant_cell"])] for row in rows]
+    for field in ("output_capacitance_fF", "cell_delay_ps", "variant_area_um2"):
+        table[field] = [np.nan if row[field] is None else row[field] for row in rows]
+    np.save(out_dir / "rows.npy", table)
+
+    meta = {
+        "version": COLUMNS_VERSION,
+        "rows": len(rows),
+        "timing": {field: rows[0][field] for field in COLUMNS_TIMING_FIELDS} if rows else {},
+        "stages": [{field: first_rows[gate][field] for field in COLUMNS_STAGE_FIELDS} for gate in gates],
+        "variant_names": variant_names,
+    }
+    with (out_dir / "meta.json").open("w") as fh:
+        json.dump(meta, fh, indent=2)
+
+
+def read_columns(in_dir: Path) -> Tuple[Dict[str, object], List[Dict[str, object]], Dict[str, object]]:
+    """Load a write_columns() directory as (timing, stages, sweep).
+
+    The sweep arrays are read-only views into the memory-mapped rows.npy.
+    Missing values come back as NaN, as they would from the CSV.
+    """
+    with (in_dir / "meta.json").open() as fh:
+        meta = json.load(fh)
+    if meta.get("version") != COLUMNS_VERSION:
+        raise ValueError(f"Unsupported columnar format version in {in_dir}: {meta.get('version')}")
+
+    def missing_as_nan(record: Dict[str, object]) -> Dict[str, object]:
+        return {key: math.nan if value is None else value for key, value in record.items()}
+
+    table = np.load(in_dir / "rows.npy", mmap_mode="r")
+    sweep = {
+        "stage": table["stage"],
+        "variant_code": table["variant"],
+        "variant_names": meta["variant_names"],
+        "output_capacitance_fF": table["output_capacitance_fF"],
+        "cell_delay_ps": table["cell_delay_ps"],
+        "variant_area_um2": table["variant_area_um2"],
+    }
+    return missing_as_nan(meta["timing"]), [missing_as_nan(stage) for stage in meta["stages"]], sweep
+
+
 def build_rows(
     summary: Dict[str, object],
     stages: Sequence[Dict[str, object]],
     libdb: LibertyDatabase,
     spef: SpefParser,
+    corners: Optional[Dict[str, LibertyDatabase]] = None,
 ) -> List[Dict[str, object]]:
+    """One row per (stage, variant, load); per corner too if corners are given.
+
+    With corners (name -> that corner's cells) delays come from every corner
+    and each row says which. Pin caps and areas still come from libdb.
+    """
     rows: List[Dict[str, object]] = []
     total_slack = as_float(summary.get("total_slack_ps"))
     t_period = as_float(summary.get("clock_period_ps"))
@@ -499,7 +1190,10 @@ def build_rows(
         else:
             clock_period_display = f"{t_period:.3f} ps"
     for stage in stages:
-        variants = stage_variants(stage, libdb)
+        if corners:
+            variants = corner_stage_variants(stage, corners)
+        else:
+            variants = [(None, *variant) for variant in stage_variants(stage, libdb)]
         if not variants:
             continue
         stage_index = stage.get("stage_index")
@@ -511,37 +1205,76 @@ def build_rows(
         wire_cap_fF = spef_info["wire_cap_pf"] * PF_TO_FF
         wire_res = spef_info["wire_res_ohm"]
         downstream_cap_fF = compute_downstream_cap(stage, libdb)
-        for variant_cell, load_pf, delay_ps in variants:
+        for corner, variant_cell, load_pf, delay_ps in variants:
             variant_cell_obj = libdb.get_cell(variant_cell)
             variant_area = None
             if variant_cell_obj and variant_cell_obj.area is not None:
                 variant_area = variant_cell_obj.area
-            rows.append(
-                {
-                    "gate_index": stage_index,
-                    "instance_name": inst_name,
-                    "original_cell": original_cell,
-                    "variant_cell": variant_cell,
-                    "variant_area_um2": variant_area,
-                    "fixed_input_slew_ps": input_slew_ps,
-                    "output_capacitance_fF": load_pf * PF_TO_FF,
-                    "cell_delay_ps": delay_ps,
-                    "global_T_period_ps": t_period,
-                    "global_T_skew_ps": t_skew,
-                    "global_T_setup_ps": t_setup,
-                    "global_T_hold_ps": t_hold,
-                    "t_clk_q_max_ps": clk_q_max,
-                    "t_clk_q_min_ps": clk_q_min,
-                    "wire_resistance_ohm": wire_res,
-                    "wire_capacitance_fF": wire_cap_fF,
-                    "downstream_input_cap_fF": downstream_cap_fF,
-                    "clock_period_ps_and_freq": clock_period_display,
-                    "global_slack_ps": total_slack,
-                }
-            )
+            row = {
+                "gate_index": stage_index,
+                "instance_name": inst_name,
+                "original_cell": original_cell,
+                "variant_cell": variant_cell,
+                "variant_area_um2": variant_area,
+                "fixed_input_slew_ps": input_slew_ps,
+                "output_capacitance_fF": load_pf * PF_TO_FF,
+                "cell_delay_ps": delay_ps,
+                "global_T_period_ps": t_period,
+                "global_T_skew_ps": t_skew,
+                "global_T_setup_ps": t_setup,
+                "global_T_hold_ps": t_hold,
+                "t_clk_q_max_ps": clk_q_max,
+                "t_clk_q_min_ps": clk_q_min,
+                "wire_resistance_ohm": wire_res,
+                "wire_capacitance_fF": wire_cap_fF,
+                "downstream_input_cap_fF": downstream_cap_fF,
+                "clock_period_ps_and_freq": clock_period_display,
+                "global_slack_ps": total_slack,
+            }
+            if corner is not None:
+                row["corner"] = corner
+            rows.append(row)
     return rows
 
 
+def load_libraries(
+    args: argparse.Namespace, lib_paths: Sequence[Path]
+) -> Tuple[LibertyDatabase, Optional[Dict[str, LibertyDatabase]]]:
+    """Open the liberty cells as the --lib-* and --corners options ask.
+
+    Returns the database pin caps and areas are read from and, with
+    --corners, one database per corner (the first corner's is also the one
+    returned first). Each corner's libs are cached on their own.
+    """
+    options = {
+        "cache_dir": None if args.no_lib_cache else args.lib_cache,
+        "parser": args.lib_parser,
+        "lazy": args.lazy_lib,
+        "jobs": args.jobs,
+    }
+    if not args.corners:
+        with flow_trace.phase("liberty"):
+            libdb = LibertyDatabase(lib_paths, **options)
+        flow_trace.count("liberty_files", len(lib_paths))
+        print(libdb.load_summary())
+        return libdb, None
+    names = None if args.corners == "all" else [name for name in re.split(r"[,\s]+", args.corners) if name]
+    try:
+        groups = group_corners(lib_paths, names)
+    except ValueError as exc:
+        raise SystemExit(str(exc))
+    if not groups:
+        raise SystemExit("No liberty file names a corner (e.g. *__tt_025C_1v80.lib)")
+    corners: Dict[str, LibertyDatabase] = {}
+    with flow_trace.phase("liberty"):
+        for corner, corner_paths in groups.items():
+            corners[corner] = LibertyDatabase(corner_paths, **options)
+            print(f"[{corner}] {corners[corner].load_summary()}")
+    flow_trace.count("liberty_files", len(lib_paths))
+    flow_trace.count("corners", len(corners))
+    return next(iter(corners.values())), corners
+
+
 def parse_args() -> argparse.Namespace:
     script_dir = Path(__file__).resolve().parent
     default_results = script_dir / "results" / "sky130hd" / "gcd" / "base"
@@ -570,6 +1303,55 @@ def parse_args() -> argparse.Namespace:
         default=default_results / "critical_path_variants.csv",
         help="Destination CSV path.",
     )
+    parser.add_argument(
+        "--lib-cache",
+        type=Path,
+        default=script_dir / ".liberty_cache",
+        help="Directory for the parsed liberty cache.",
+    )
+    parser.add_argument(
+        "--no-lib-cache",
+        action="store_true",
+        help="Always re-parse liberty files instead of using the cache.",
+    )
+    parser.add_argument(
+        "--lib-parser",
+        choices=LIBERTY_PARSERS,
+        default="stream",
+        help="Liberty reader: single-pass tokenizer or the legacy regex scanner.",
+    )
+    parser.add_argument(
+        "--lazy-lib",
+        action="store_true",
+        help="Index cell offsets only and parse cells when the path needs them.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Parse liberty cells in a pool of this many processes.",
+    )
+    parser.add_argument(
+        "--corners",
+        default=None,
+        help="Characterize at these PVT corners (comma- or space-separated, e.g. tt_025C_1v80,ss_100C_1v60, or 'all').",
+    )
+    parser.add_argument(
+        "--full-spef",
+        action="store_true",
+        help="Parse every SPEF net instead of only the nets on the path.",
+    )
+    parser.add_argument(
+        "--spef-index",
+        action="store_true",
+        help="Use (and build if stale) a <spef>.idx net offset index for random access.",
+    )
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="csv",
+        help="Write the wide CSV, or the columnar form (meta.json + rows.npy) to <output>.cols/.",
+    )
     return parser.parse_args()
 
 
@@ -587,13 +1369,29 @@ def main() -> None:
     stages = data.get("stages")
     if not isinstance(summary, dict) or not isinstance(stages, list):
         raise SystemExit("Malformed JSON payload.")
-    libdb = LibertyDatabase(lib_paths)
-    spef = SpefParser(args.spef)
-    rows = build_rows(summary, stages, libdb, spef)
+    if args.corners and args.format == "columns":
+        raise SystemExit("--corners writes a CSV; the columnar format holds one corner.")
+    libdb, corners = load_libraries(args, lib_paths)
+    with flow_trace.phase("spef"):
+        spef = SpefParser(
+            args.spef,
+            nets=None if args.full_spef else stage_nets(stages),
+            use_index=args.spef_index,
+        )
+    with flow_trace.phase("build_rows"):
+        rows = build_rows(summary, stages, libdb, spef, corners)
+    flow_trace.count("stages", len(stages))
+    flow_trace.count("rows", len(rows))
     if not rows:
         print("[WARN] No variant rows generated.", file=sys.stderr)
-    write_csv(rows, args.output)
-    print(f"Wrote {len(rows)} rows to {args.output}")
+    with flow_trace.phase("write_rows"):
+        if args.format == "columns":
+            out_dir = args.output.with_suffix(".cols")
+            write_columns(rows, out_dir)
+            print(f"Wrote {len(rows)} rows to {out_dir}")
+        else:
+            write_csv(rows, args.output)
+            print(f"Wrote {len(rows)} rows to {args.output}")
 
 
 if __name__ == "__main__":
@@ -6,12 +6,19 @@ from __future__ import annotations
 import argparse
 import sys
 from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
 
+import flow_trace
 from analyze_critical_path import (
+    LIBERTY_PARSERS,
+    OUTPUT_FORMATS,
     LibertyDatabase,
     SpefParser,
     build_rows,
     load_json,
+    load_libraries,
+    stage_nets,
+    write_columns,
     write_csv,
 )
 
@@ -30,10 +37,10 @@ def resolve_spef(path: Path, json_path: Path) -> Path:
     raise SystemExit(f"SPEF file not found (checked {', '.join(str(c) for c in candidates)})")
 
 
-def parse_args() -> argparse.Namespace:
+def build_parser(description: Optional[str] = __doc__) -> argparse.ArgumentParser:
     script_dir = Path(__file__).resolve().parent.parent
     default_results = script_dir / "results" / "sky130hd" / "gcd" / "base"
-    parser = argparse.ArgumentParser(description=__doc__)
+    parser = argparse.ArgumentParser(description=description)
     parser.add_argument(
         "--path-json",
         type=Path,
@@ -58,29 +65,112 @@ def parse_args() -> argparse.Namespace:
         default="critical_path_variants_reg.csv",
         help="Destination CSV path.",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--lib-cache",
+        type=Path,
+        default=Path(__file__).resolve().parent / ".liberty_cache",
+        help="Directory for the parsed liberty cache.",
+    )
+    parser.add_argument(
+        "--no-lib-cache",
+        action="store_true",
+        help="Always re-parse liberty files instead of using the cache.",
+    )
+    parser.add_argument(
+        "--lib-parser",
+        choices=LIBERTY_PARSERS,
+        default="stream",
+        help="Liberty reader: single-pass tokenizer or the legacy regex scanner.",
+    )
+    parser.add_argument(
+        "--lazy-lib",
+        action="store_true",
+        help="Index cell offsets only and parse cells when the path needs them.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Parse liberty cells in a pool of this many processes.",
+    )
+    parser.add_argument(
+        "--corners",
+        default=None,
+        help="Characterize at these PVT corners (comma- or space-separated, e.g. tt_025C_1v80,ss_100C_1v60, or 'all').",
+    )
+    parser.add_argument(
+        "--full-spef",
+        action="store_true",
+        help="Parse every SPEF net instead of only the nets on the path.",
+    )
+    parser.add_argument(
+        "--spef-index",
+        action="store_true",
+        help="Use (and build if stale) a <spef>.idx net offset index for random access.",
+    )
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="csv",
+        help="Write the wide CSV, or the columnar form (meta.json + rows.npy) to <output>.cols/.",
+    )
+    return parser
 
 
-def main() -> None:
-    args = parse_args()
-    if not args.path_json.exists():
-        raise SystemExit(f"GRT critical path JSON not found: {args.path_json}")
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    return build_parser().parse_args(argv)
+
+
+def load_sources(
+    args: argparse.Namespace, stages: Sequence[Dict[str, object]]
+) -> Tuple[LibertyDatabase, SpefParser, Optional[Dict[str, LibertyDatabase]]]:
+    """Open the liberty cells (per corner with --corners) and the SPEF nets the given stages need."""
     lib_paths = sorted(args.lib_dir.glob("*.lib"))
     if not lib_paths:
         raise SystemExit(f"No liberty files found in {args.lib_dir}")
     spef_path = resolve_spef(args.spef, args.path_json)
+    libdb, corners = load_libraries(args, lib_paths)
+    with flow_trace.phase("spef"):
+        spef = SpefParser(
+            spef_path,
+            nets=None if args.full_spef else stage_nets(stages),
+            use_index=args.spef_index,
+        )
+    return libdb, spef, corners
+
+
+def extract_rows(args: argparse.Namespace) -> List[Dict[str, object]]:
+    """Load the path JSON, liberty cells and SPEF nets and build the variant rows."""
+    if not args.path_json.exists():
+        raise SystemExit(f"GRT critical path JSON not found: {args.path_json}")
     data = load_json(args.path_json)
     summary = data.get("summary")
     stages = data.get("stages")
     if not isinstance(summary, dict) or not isinstance(stages, list):
         raise SystemExit("Malformed JSON payload.")
-    libdb = LibertyDatabase(lib_paths)
-    spef = SpefParser(spef_path)
-    rows = build_rows(summary, stages, libdb, spef)
+    libdb, spef, corners = load_sources(args, stages)
+    with flow_trace.phase("build_rows"):
+        rows = build_rows(summary, stages, libdb, spef, corners)
+    flow_trace.count("stages", len(stages))
+    flow_trace.count("rows", len(rows))
+    return rows
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    if args.corners and args.format == "columns":
+        raise SystemExit("--corners writes a CSV; the columnar format holds one corner.")
+    rows = extract_rows(args)
     if not rows:
         print("[WARN] No variant rows generated.", file=sys.stderr)
-    write_csv(rows, args.output)
-    print(f"Wrote {len(rows)} rows to {args.output}")
+    with flow_trace.phase("write_rows"):
+        if args.format == "columns":
+            out_dir = args.output.with_suffix(".cols")
+            write_columns(rows, out_dir)
+            print(f"Wrote {len(rows)} rows to {out_dir}")
+        else:
+            write_csv(rows, args.output)
+            print(f"Wrote {len(rows)} rows to {args.output}")
 
 
 if __name__ == "__main__":
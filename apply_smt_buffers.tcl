@@ -12,6 +12,16 @@ set lib_files     "../platforms/sky130hd/lib/sky130_fd_sc_hd__tt_025C_1v80.lib"
 set solution_file "buffers.sol"
 set odb_out       "../results/sky130hd/gcd/base/after_smt.odb"
 
+# SMT_CORNERS (as in setup_sta.tcl): one liberty per corner
+set corners {}
+if {[info exists ::env(SMT_CORNERS)] && [string trim $::env(SMT_CORNERS)] ne ""} {
+    set corners $::env(SMT_CORNERS)
+    set lib_files {}
+    foreach corner $corners {
+        lappend lib_files "../platforms/sky130hd/lib/sky130_fd_sc_hd__${corner}.lib"
+    }
+}
+
 # 1 LEFs
 set tech_lef "../platforms/sky130hd/lef/sky130_fd_sc_hd.tlef"
 if {![file exists $tech_lef]} {
@@ -46,15 +56,24 @@ if {[file exists $def_file]} {
 }
 
 # 3 Liberty
-foreach lib $lib_files {
+if {$corners ne ""} {
+    puts "INFO: define_corners $corners"
+    define_corners {*}$corners
+}
+foreach lib $lib_files corner $corners {
     set lib_trim [string trim $lib]
     if {$lib_trim eq ""} { continue }
     if {![file exists $lib_trim]} {
         puts "WARNING: Liberty '$lib_trim' not found, skipping"
         continue
     }
-    puts "INFO: read_liberty $lib_trim"
-    read_liberty $lib_trim
+    if {$corner ne ""} {
+        puts "INFO: read_liberty -corner $corner $lib_trim"
+        read_liberty -corner $corner $lib_trim
+    } else {
+        puts "INFO: read_liberty $lib_trim"
+        read_liberty $lib_trim
+    }
 }
 
 
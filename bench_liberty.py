@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Benchmark the liberty readers on a platform lib directory.
+
+Parses every *.lib with the legacy regex scanner and the single-pass
+tokenizer (no cache), reports wall time per parser, and checks that both
+produce the same cell areas, input pin capacitances and timing tables.
+
+Lazy mode is measured the way extraction uses it: open the libs, then
+resolve every variant of a few cell families. Peak Python heap per mode is
+taken in a separate tracemalloc pass so it does not skew the timings.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence
+
+from analyze_critical_path import LIBERTY_PARSERS, LibertyDatabase
+from liberty_parser import TIMING_TABLES
+
+
+def timing_signature(pin: Dict[str, object]) -> List[tuple]:
+    entries = []
+    for timing in pin.get("timing", []):
+        entries.append(
+            (
+                timing.get("related_pin"),
+                timing.get("timing_type"),
+                tuple(repr(timing.get(key)) for key in TIMING_TABLES),
+            )
+        )
+    return entries
+
+
+def compare(reference: LibertyDatabase, candidate: LibertyDatabase) -> List[str]:
+    problems: List[str] = []
+    if list(reference.cells) != list(candidate.cells):
+        problems.append(
+            f"cell sets differ ({len(reference.cells)} vs {len(candidate.cells)})"
+        )
+    for name, ref_cell in reference.cells.items():
+        cell = candidate.get_cell(name)
+        if cell is None:
+            continue
+        if ref_cell.area != cell.area:
+            problems.append(f"{name}: area {ref_cell.area} vs {cell.area}")
+        for pin_name, pin in cell.pins.items():
+            ref_pin = ref_cell.pins.get(pin_name)
+            if ref_pin is None:
+                problems.append(f"{name}/{pin_name}: missing from reference")
+                continue
+            # The regex scanner picks up max_capacitance on output pins, so only
+            # input pin caps are comparable (and only those feed the flow).
+            if pin.get("direction") == "input" and pin.get("capacitance") != ref_pin.get("capacitance"):
+                problems.append(
+                    f"{name}/{pin_name}: capacitance {ref_pin.get('capacitance')} vs {pin.get('capacitance')}"
+                )
+            if timing_signature(pin) != timing_signature(ref_pin):
+                problems.append(f"{name}/{pin_name}: timing tables differ")
+    return problems
+
+
+def load_eager(lib_paths: Sequence[Path], parser: str, jobs: int = 1) -> Callable[[], LibertyDatabase]:
+    return lambda: LibertyDatabase(lib_paths, parser=parser, jobs=jobs)
+
+
+def load_lazy(lib_paths: Sequence[Path], families: Sequence[str]) -> Callable[[], LibertyDatabase]:
+    def run() -> LibertyDatabase:
+        libdb = LibertyDatabase(lib_paths, lazy=True)
+        for cell_name in families:
+            for variant in libdb.family_variants(cell_name):
+                libdb.get_cell(variant)
+        return libdb
+
+    return run
+
+
+def best_time(loader: Callable[[], LibertyDatabase], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        loader()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_memory_mb(loader: Callable[[], LibertyDatabase]) -> float:
+    tracemalloc.start()
+    libdb = loader()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    libdb.close()
+    return peak / 1e6
+
+
+def parse_args() -> argparse.Namespace:
+    script_dir = Path(__file__).resolve().parent.parent
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--lib-dir",
+        type=Path,
+        default=script_dir / "platforms" / "sky130hd" / "lib",
+        help="Directory containing Sky130HD liberty files.",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        help="Parse each lib set this many times and keep the best time.",
+    )
+    parser.add_argument(
+        "--families",
+        default="sky130_fd_sc_hd__buf_1,sky130_fd_sc_hd__nor2b_1",
+        help="Comma-separated cells whose families the lazy run resolves.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=0,
+        help="Also time a process-pool parse with this many workers.",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    lib_paths = sorted(args.lib_dir.glob("*.lib"))
+    if not lib_paths:
+        raise SystemExit(f"No liberty files found in {args.lib_dir}")
+    total_mb = sum(path.stat().st_size for path in lib_paths) / 1e6
+    print(f"{len(lib_paths)} liberty file(s), {total_mb:.1f} MB")
+
+    families = [name for name in args.families.split(",") if name]
+    loaders: Dict[str, Callable[[], LibertyDatabase]] = {
+        parser: load_eager(lib_paths, parser) for parser in LIBERTY_PARSERS
+    }
+    loaders["lazy"] = load_lazy(lib_paths, families)
+    if args.jobs > 1:
+        loaders[f"jobs={args.jobs}"] = load_eager(lib_paths, "stream", args.jobs)
+
+    print(f"{'mode':<8} {'seconds':>9} {'MB/s':>8} {'peak MB':>8}")
+    timings: Dict[str, float] = {}
+    for mode, loader in loaders.items():
+        seconds = best_time(loader, args.repeat)
+        timings[mode] = seconds
+        print(
+            f"{mode:<8} {seconds:>9.3f} {total_mb / seconds if seconds else 0.0:>8.1f} "
+            f"{peak_memory_mb(loader):>8.1f}"
+        )
+    print(f"stream vs regex: {timings['regex'] / timings['stream']:.2f}x")
+    print(f"lazy vs stream:  {timings['stream'] / timings['lazy']:.2f}x ({', '.join(families)})")
+    if args.jobs > 1:
+        print(f"jobs={args.jobs} vs stream: {timings['stream'] / timings[f'jobs={args.jobs}']:.2f}x")
+
+    databases = {parser: loaders[parser]() for parser in LIBERTY_PARSERS}
+    lazy_db = LibertyDatabase(lib_paths, lazy=True)
+    for name in lazy_db.cell_names():
+        lazy_db.get_cell(name)
+    databases["lazy"] = lazy_db
+    if args.jobs > 1:
+        databases["parallel"] = loaders[f"jobs={args.jobs}"]()
+    problems = compare(databases["regex"], databases["stream"])
+    for mode in ("lazy", "parallel"):
+        if mode in databases:
+            problems += [f"{mode}: {problem}" for problem in compare(databases["stream"], databases[mode])]
+    if problems:
+        for problem in problems[:20]:
+            print(f"[DIFF] {problem}", file=sys.stderr)
+        raise SystemExit(f"{len(problems)} difference(s) between parsers")
+    print("All modes agree on areas, input pin caps and timing tables.")
+
+
+if __name__ == "__main__":
+    main()
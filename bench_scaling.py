@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Measure how each engine scales with path length and choices per stage.
+
+For every (stages, choices, seed) point a problem comes from gen_paths.py.
+Each engine in --engines runs on it in a fresh child process, so peak memory
+(max RSS) belongs to that run alone. Engine names are the ones bench_solver.py
+takes: "dp" or an SMTsolver encoding. Every row records build time, solve
+time, peak memory, the Z3 result and the setup/hold slack of the chosen cells,
+re-timed with PathModel. "agrees" says whether the slacks match the first
+engine that solved the same point. A run that exceeds --timeout is reported
+as "timeout" and the sweep goes on.
+
+    python3 bench_scaling.py --stages 4,8,16,32 --choices 3,7 --engines dp,pb,lra
+
+The rows go to --output as CSV, or as JSON if the name ends in .json, so
+reports from different hosts or commits can be compared directly.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import multiprocessing
+import platform
+import queue
+import resource
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from gen_paths import TEMPLATE, generate
+from path_model import PathModel
+
+FIELDS = [
+    "stages", "choices", "seed", "engine", "result", "build_s", "solve_s", "peak_mb",
+    "assertions", "bool_vars", "real_vars", "conflicts", "decisions", "slack_setup", "slack_hold", "agrees",
+]
+
+
+def z3_counter(stats: Dict[str, object], *keys: str) -> object:
+    # Z3 names some counters per engine ("conflicts" vs "sat conflicts")
+    z3 = stats.get("z3", {}) if stats else {}
+    return sum(z3.get(key, 0) for key in keys) if any(key in z3 for key in keys) else ""
+
+
+def peak_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def child(data: Dict[str, object], engine: str, timeout: float, results: "multiprocessing.Queue") -> None:
+    try:
+        from bench_solver import run_encoding
+
+        run = run_encoding(data, engine, timeout)
+        run["peak_mb"] = peak_mb()
+    except Exception as exc:
+        run = {"result": f"error: {exc}", "cells": None}
+    results.put(run)
+
+
+def run_isolated(data: Dict[str, object], engine: str, timeout: float) -> Dict[str, object]:
+    results: "multiprocessing.Queue" = multiprocessing.Queue()
+    proc = multiprocessing.Process(target=child, args=(data, engine, timeout, results), daemon=True)
+    proc.start()
+    try:
+        # Z3 honours the timeout itself; the margin covers building the encoding
+        run = results.get(timeout=timeout * 2 + 30 if timeout > 0 else None)
+    except queue.Empty:
+        proc.kill()
+        run = {"result": "timeout", "cells": None}
+    proc.join()
+    return run
+
+
+def bench_point(stages: int, choices: int, seed: int, engines: List[str], timeout: float,
+                template: Path) -> List[Dict[str, object]]:
+    data = generate(stages, choices, seed, template)
+    path = PathModel(data)
+    rows = []
+    reference: Optional[tuple] = None
+    for engine in engines:
+        run = run_isolated(data, engine, timeout)
+        row: Dict[str, object] = {
+            "stages": stages,
+            "choices": choices,
+            "seed": seed,
+            "engine": engine,
+            "result": run["result"],
+            "build_s": round(run.get("build", 0.0), 4),
+            "solve_s": round(run.get("solve", 0.0), 4),
+            "peak_mb": round(run.get("peak_mb", 0.0), 1),
+            "assertions": run.get("assertions", ""),
+            "bool_vars": (run.get("stats") or {}).get("bool_vars", ""),
+            "real_vars": (run.get("stats") or {}).get("real_vars", ""),
+            "conflicts": z3_counter(run.get("stats"), "conflicts", "sat conflicts"),
+            "decisions": z3_counter(run.get("stats"), "decisions", "sat decisions"),
+            "slack_setup": "",
+            "slack_hold": "",
+            "agrees": "",
+        }
+        if run.get("cells") is not None:
+            picks = path.picks_for(run["cells"])
+            slacks = (path.slack_setup(picks), path.slack_hold(picks))
+            row["slack_setup"] = round(float(slacks[0]), 10)
+            row["slack_hold"] = round(float(slacks[1]), 10)
+            if reference is None:
+                reference = slacks
+            row["agrees"] = slacks == reference
+        rows.append(row)
+    return rows
+
+
+def write_report(rows: List[Dict[str, object]], output: Path) -> None:
+    if output.suffix == ".json":
+        meta = {"python": platform.python_version(), "machine": platform.machine(), "cpu": platform.processor()}
+        with output.open("w") as fh:
+            json.dump({"host": meta, "rows": rows}, fh, indent=1)
+        return
+    with output.open("w", newline="") as fh:
+        writer = csv.DictWriter(fh, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def int_list(text: str) -> List[int]:
+    return [int(item) for item in text.split(",") if item]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stages", type=int_list, default=int_list("4,8,12,16,24,32"), help="Path lengths.")
+    parser.add_argument("--choices", type=int_list, default=int_list("3,7"), help="Choices per stage.")
+    parser.add_argument("--seeds", type=int, default=1, help="Problems per (stages, choices) point.")
+    parser.add_argument("--engines", default="dp,pb,lra", help="Comma-separated engines; the first is the reference.")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-run Z3 timeout in seconds (0 = none).")
+    parser.add_argument("--template", type=Path, default=TEMPLATE, help="Solver input the generator draws from.")
+    parser.add_argument("--output", type=Path, default=Path("bench_scaling.csv"), help="Report (.csv or .json).")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    engines = [name for name in args.engines.split(",") if name]
+    print(f"{'N':>4} {'K':>3} {'seed':>4} {'engine':<6} {'result':>8} {'build s':>8} {'solve s':>9} "
+          f"{'peak MB':>8} {'slack_setup':>14} {'agrees':>6}")
+    rows: List[Dict[str, object]] = []
+    for stages in args.stages:
+        for choices in args.choices:
+            for seed in range(args.seeds):
+                for row in bench_point(stages, choices, seed, engines, args.timeout, args.template):
+                    rows.append(row)
+                    print(f"{row['stages']:>4} {row['choices']:>3} {row['seed']:>4} {row['engine']:<6} "
+                          f"{row['result']:>8} {row['build_s']:>8.3f} {row['solve_s']:>9.3f} "
+                          f"{row['peak_mb']:>8.1f} {row['slack_setup']!s:>14} {row['agrees']!s:>6}")
+    write_report(rows, args.output)
+    disagree = [row for row in rows if row["agrees"] is False]
+    print(f"Wrote {len(rows)} row(s) to {args.output}")
+    if disagree:
+        raise SystemExit(f"{len(disagree)} run(s) disagree with the reference engine's slacks")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark the SMTsolver encodings and the DP engine on a solver_input.json.
+
+For each Z3 encoding, builds the Optimize instance and runs check(); "dp"
+runs DPsolver.optimize() instead. Build and solve wall time are reported.
+The chosen cells are then re-timed with the exact PathModel arithmetic, and
+every encoding must reach the same setup and hold slack as the first one.
+Ties between equally fast cells may be broken differently, so only the
+slacks are compared, not the cells.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from z3 import sat
+
+from dp_solver import DPsolver
+from path_model import PathModel
+from solver import ENCODINGS, SMTsolver
+
+
+def run_encoding(data: Dict[str, object], encoding: str, timeout_s: float) -> Dict[str, object]:
+    start = time.perf_counter()
+    if encoding == "dp":
+        inst = DPsolver(data)
+        built = time.perf_counter()
+        picks = inst.optimize()
+        return {
+            "encoding": encoding,
+            "result": "optimal",
+            "build": built - start,
+            "solve": time.perf_counter() - built,
+            "assertions": 0,
+            "cells": inst.extract_buffers(picks),
+        }
+    inst = SMTsolver(data, encoding=encoding)
+    built = time.perf_counter()
+    if timeout_s > 0:
+        inst.solver.set("timeout", int(timeout_s * 1000))
+    result = inst.solver.check()
+    solved = time.perf_counter()
+    cells: Optional[Dict[str, str]] = None
+    if result == sat:
+        cells = inst.extract_buffers(inst.solver.model())
+    return {
+        "encoding": encoding,
+        "result": str(result),
+        "build": built - start,
+        "solve": solved - built,
+        "assertions": len(inst.solver.assertions()),
+        "cells": cells,
+        "stats": inst.collect_stats(result, solved - built, inst.solver),
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--input",
+        type=Path,
+        default=Path("solver_input.json"),
+        help="Solver input JSON.",
+    )
+    parser.add_argument(
+        "--encodings",
+        default=",".join(("dp",) + ENCODINGS),
+        help="Comma-separated encodings to run, first one is the reference.",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=0.0,
+        help="Per-encoding Z3 timeout in seconds (0 = none).",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    with args.input.open() as fh:
+        data = json.load(fh)
+    path = PathModel(data)
+    sizes = [len(choices) for choices in path.choices]
+    print(f"{len(sizes)} stage(s), {sum(sizes)} decision variable(s)")
+
+    print(f"{'encoding':<9} {'result':>8} {'build s':>8} {'solve s':>9} {'asserts':>8} {'slack_setup':>14}")
+    runs: List[Dict[str, object]] = []
+    for encoding in [name for name in args.encodings.split(",") if name]:
+        run = run_encoding(data, encoding, args.timeout)
+        slack = ""
+        if run["cells"] is not None:
+            picks = path.picks_for(run["cells"])
+            run["slacks"] = (path.slack_setup(picks), path.slack_hold(picks))
+            slack = f"{float(run['slacks'][0]):.6f}"
+        runs.append(run)
+        print(
+            f"{encoding:<9} {run['result']:>8} {run['build']:>8.3f} {run['solve']:>9.3f} "
+            f"{run['assertions']:>8} {slack:>14}"
+        )
+
+    solved = [run for run in runs if "slacks" in run]
+    if not solved:
+        raise SystemExit("No encoding produced a model")
+    reference = solved[0]
+    for run in solved[1:]:
+        if run["slacks"] != reference["slacks"]:
+            raise SystemExit(
+                f"{run['encoding']} slacks {tuple(map(float, run['slacks']))} differ from "
+                f"{reference['encoding']} {tuple(map(float, reference['slacks']))}"
+            )
+        ratio = run["solve"] / reference["solve"] if reference["solve"] else float("inf")
+        print(f"{run['encoding']} solve time: {ratio:.1f}x {reference['encoding']}")
+    print(f"{len(solved)} of {len(runs)} encoding(s) solved, all agree on setup and hold slack.")
+
+
+if __name__ == "__main__":
+    main()
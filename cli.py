@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Single entry point for the resizing flow.
+
+    extract   build variant rows from the STA path JSON (analyze_critical_path_reg.py)
+    convert   regress the variant CSV into solver_input.json (csvtojson.py)
+    solve     run the Z3 optimizer (or --engine dp / portfolio) on solver_input.json and write buffers.sol
+    pareto    write the whole delay/area trade-off front of solver_input.json as a CSV table
+    apply     resize cells in OpenROAD from buffers.sol
+    loop      extract -> solve -> apply in one process, without the CSV/JSON files
+    refine    solve -> STA -> feed back with one live solver until STA is met (closed_loop.py)
+
+z3, pandas and numpy are imported only by the commands that use them, so
+--help and the cheap commands start quickly. extract, convert, loop and refine pass
+their remaining arguments to the underlying script (try `cli.py extract -h`).
+Use --timing to report startup, import and run time, and --trace FILE (or
+SMT_TRACE=FILE) for a per-phase JSON trace of timers, counters and peak RSS
+(flow_trace.py).
+"""
+
+from __future__ import annotations
+
+import time
+
+_CLI_START = time.perf_counter()
+# CPU time spent before this module ran: interpreter startup and site imports.
+_STARTUP_CPU = time.process_time()
+
+import argparse
+import importlib
+import subprocess
+import sys
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+OPENROAD = "../../tools/install/OpenROAD/bin/openroad"
+EXTRACT_TCL = "extract_critical_path_reg.tcl"
+
+IMPORT_TIMES: List[Tuple[str, float]] = []
+
+
+def load(module_name: str):
+    """Import a flow module on first use and record how long it took."""
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    IMPORT_TIMES.append((module_name, time.perf_counter() - start))
+    return module
+
+
+def run_sta_extraction(openroad: str) -> None:
+    subprocess.run([openroad, "-exit", EXTRACT_TCL], check=True)
+
+
+def cmd_extract(args: argparse.Namespace, rest: List[str]) -> int:
+    if args.run_sta:
+        run_sta_extraction(args.openroad)
+    load("analyze_critical_path_reg").main(rest)
+    return 0
+
+
+def cmd_convert(args: argparse.Namespace, rest: List[str]) -> int:
+    load("csvtojson").main(rest)
+    return 0
+
+
+def cmd_solve(args: argparse.Namespace, rest: List[str]) -> int:
+    if not load("main").solve(
+        args.input,
+        args.encoding,
+        args.engine,
+        args.objective,
+        args.timeout,
+        args.time_budget,
+        use_cache=not args.no_cache,
+        cache_dir=args.cache_dir,
+        stats_file=args.stats,
+    ):
+        print("Unsatisfiable. No buffer combination meets timing.", file=sys.stderr)
+        return 1
+    return 0
+
+
+def cmd_pareto(args: argparse.Namespace, rest: List[str]) -> int:
+    load("main").pareto(args.input, args.output)
+    return 0
+
+
+def cmd_apply(args: argparse.Namespace, rest: List[str]) -> int:
+    load("main").apply_solution(args.openroad)
+    return 0
+
+
+def cmd_loop(args: argparse.Namespace, rest: List[str]) -> int:
+    if args.run_sta:
+        run_sta_extraction(args.openroad)
+    if not load("pipeline").main(rest):
+        return 1
+    if not args.no_apply:
+        load("main").apply_solution(args.openroad)
+    return 0
+
+
+def cmd_refine(args: argparse.Namespace, rest: List[str]) -> int:
+    return 0 if load("closed_loop").main(rest) else 1
+
+
+COMMANDS: Dict[str, Tuple[Callable[[argparse.Namespace, List[str]], int], str, bool]] = {
+    # name: (handler, help, forwards its remaining arguments)
+    "extract": (cmd_extract, "Build variant rows from the STA critical path JSON.", True),
+    "convert": (cmd_convert, "Regress the variant CSV into solver_input.json.", True),
+    "solve": (cmd_solve, "Run the Z3 optimizer and write buffers.sol.", False),
+    "pareto": (cmd_pareto, "Write the non-dominated delay/area front as a table.", False),
+    "apply": (cmd_apply, "Resize cells in OpenROAD from buffers.sol.", False),
+    "loop": (cmd_loop, "Extract, solve and apply in one process.", True),
+    "refine": (cmd_refine, "Closed loop: re-solve with STA feedback until timing is met.", True),
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--timing",
+        action="store_true",
+        help="Report startup, import and command time on stderr.",
+    )
+    parser.add_argument(
+        "--trace",
+        default=None,
+        help="Write a per-phase timing/counter/peak-RSS JSON trace to this file (or directory).",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True, metavar="command")
+    for name, (_, help_text, forwards) in COMMANDS.items():
+        # Forwarding commands leave -h to the underlying script's parser.
+        sub = subparsers.add_parser(name, help=help_text, add_help=not forwards)
+        if name in ("extract", "loop"):
+            sub.add_argument(
+                "--run-sta",
+                action="store_true",
+                help=f"Run OpenROAD on {EXTRACT_TCL} first to refresh the path JSON.",
+            )
+        if name in ("extract", "apply", "loop"):
+            sub.add_argument("--openroad", default=OPENROAD, help="OpenROAD binary.")
+        if name in ("solve", "pareto"):
+            sub.add_argument("--input", default="solver_input.json", help="Solver input JSON.")
+        if name == "pareto":
+            sub.add_argument("--output", default="pareto.csv", help="Pareto front table (CSV).")
+        if name == "solve":
+            # Kept in sync with solver.ENCODINGS; solver.py imports z3, so it is not loaded here.
+            sub.add_argument(
+                "--encoding",
+                choices=("lra", "pb"),
+                default="lra",
+                help="Z3 encoding: lra (real-valued loads) or pb (pseudo-boolean one-hot, pairwise delays).",
+            )
+            sub.add_argument(
+                "--engine",
+                choices=("z3", "dp", "portfolio"),
+                default="z3",
+                help="z3 runs SMTsolver; dp runs the exact chain-path DP without z3; "
+                "portfolio races several Z3 configurations (portfolio.py).",
+            )
+            sub.add_argument(
+                "--objective",
+                choices=("worst", "total"),
+                default="worst",
+                help="Multi-path or multi-corner input: maximize worst setup slack or total negative slack.",
+            )
+            sub.add_argument(
+                "--timeout",
+                type=float,
+                default=None,
+                help="Multi-path or multi-corner input: seconds per Z3 check before keeping the best solution so far; "
+                "portfolio: deadline in seconds (default 60).",
+            )
+            sub.add_argument(
+                "--time-budget",
+                type=float,
+                default=None,
+                help="z3 engine: anytime solve; always writes buffers.sol with the best solution found "
+                "and notes whether it is proven optimal.",
+            )
+            sub.add_argument("--no-cache", action="store_true", help="Always solve, ignoring the solve cache.")
+            sub.add_argument(
+                "--stats",
+                default=None,
+                help="z3 engine: write problem size, Z3 statistics and objective bounds to this JSON file "
+                "(always solves; the result is still cached).",
+            )
+            sub.add_argument(
+                "--cache-dir",
+                default=None,
+                help="Solve cache directory (default .solve_cache next to the scripts).",
+            )
+        if name == "loop":
+            sub.add_argument("--no-apply", action="store_true", help="Stop after writing buffers.sol.")
+    return parser
+
+
+def report_timing(command: Optional[str], command_start: float) -> None:
+    now = time.perf_counter()
+    imports = sum(seconds for _, seconds in IMPORT_TIMES)
+    detail = ", ".join(f"{name} {seconds * 1e3:.0f} ms" for name, seconds in IMPORT_TIMES)
+    print(
+        f"[TIME] startup {_STARTUP_CPU * 1e3:.0f} ms cpu, cli ready {(command_start - _CLI_START) * 1e3:.0f} ms, "
+        f"imports {imports * 1e3:.0f} ms{f' ({detail})' if detail else ''}, "
+        f"{command or 'cli'} {(now - command_start - imports) * 1e3:.0f} ms",
+        file=sys.stderr,
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = build_parser()
+    command_start = time.perf_counter()
+    timing = "--timing" in (sys.argv[1:] if argv is None else argv)
+    command = None
+    try:
+        args, rest = parser.parse_known_args(argv)
+        command = args.command
+        handler, _, forwards = COMMANDS[command]
+        if rest and not forwards:
+            parser.error(f"unrecognized arguments: {' '.join(rest)}")
+        command_start = time.perf_counter()
+        if args.trace:
+            flow_trace = load("flow_trace")
+            flow_trace.enable(args.trace)
+            with flow_trace.phase(command):
+                return handler(args, rest)
+        return handler(args, rest)
+    finally:
+        if timing:
+            report_timing(command, command_start)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Closed-loop sizing: solve, check the result in STA, feed the result back.
+
+One SMTsolver stays live for the whole loop. After each check() the chosen
+cells go to buffers.sol and STA measures them. If timing is not met, the
+measurement goes back into the same solver as a permanent cut, so the next
+check() reuses everything Z3 has already learned instead of re-encoding the
+path:
+
+    bound  the assignment's slack is corrected to what STA measured
+           (SMTsolver.add_sta_feedback). The solver moves on only if another
+           assignment now looks better, and stops when the corrected model
+           picks an assignment it has already measured.
+    block  the assignment is excluded (SMTsolver.add_conflict), so every
+           iteration tries a new one.
+
+STA runs in one persistent STASession (sta_session.py), so the design is
+loaded once per loop; --one-shot starts OpenROAD on evaluate_sta.tcl for
+every candidate instead. With --candidates K each round checks the solver's
+top K assignments, and --workers N spreads them over an STAPool
+(sta_pool.py) of N preloaded OpenROAD processes.
+
+The loop stops when STA reports non-negative setup and hold slack, or after
+--max-iterations. buffers.sol is left holding the best assignment STA saw.
+Per-iteration solve and STA times are printed at the end.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from z3 import sat
+
+from path_model import write_solution
+from solver import ENCODINGS, SMTsolver
+from sta_pool import STAPool
+from sta_session import STASession, parse_worst_slacks
+
+OPENROAD = "../../tools/install/OpenROAD/bin/openroad"
+EVALUATE_TCL = "evaluate_sta.tcl"
+FEEDBACK = ("bound", "block")
+
+# (solution file) -> (setup slack, hold slack) in ns, as STA reports them
+Evaluator = Callable[[str], Tuple[float, float]]
+
+
+def openroad_evaluator(openroad: str = OPENROAD, script: str = EVALUATE_TCL) -> Evaluator:
+    """Run a fresh OpenROAD on evaluate_sta.tcl for every candidate (--one-shot)."""
+
+    def evaluate(solution_file: str) -> Tuple[float, float]:
+        result = subprocess.run(
+            [openroad, "-exit", script],
+            check=True,
+            capture_output=True,
+            text=True,
+            env={**os.environ, "SOLUTION_FILE": solution_file},
+        )
+        return parse_worst_slacks(result.stdout.splitlines())
+
+    return evaluate
+
+
+class ClosedLoop:
+    def __init__(
+        self,
+        data: Dict[str, object],
+        evaluate: Evaluator,
+        encoding: str = "pb",
+        feedback: str = "bound",
+        solution_file: str = "buffers.sol",
+        candidates: int = 1,
+    ) -> None:
+        if feedback not in FEEDBACK:
+            raise ValueError(f"Unknown feedback '{feedback}', expected one of {FEEDBACK}")
+        start = time.perf_counter()
+        self.inst = SMTsolver(data, encoding=encoding, sta_feedback=feedback == "bound")
+        self.build_time = time.perf_counter() - start
+        self.evaluate = evaluate
+        self.feedback = feedback
+        self.solution_file = solution_file
+        self.count = candidates
+        self.rounds = 0
+        self.history: List[Dict[str, object]] = []
+
+    def candidates(self, count: int) -> List[object]:
+        """Up to count models: the solver's pick, then the next best ones."""
+        models = []
+        self.inst.solver.push()
+        while len(models) < count and self.inst.solver.check() == sat:
+            models.append(self.inst.solver.model())
+            if len(models) < count:
+                # Only for this round; pop() lets later rounds pick it again
+                self.inst.add_conflict(models[-1])
+        self.inst.solver.pop()
+        return models
+
+    def solution_files(self, count: int) -> List[str]:
+        if count == 1:
+            return [self.solution_file]
+        root, ext = os.path.splitext(self.solution_file)
+        return [f"{root}.{c}{ext}" for c in range(count)]
+
+    def step(self) -> List[Dict[str, object]]:
+        """One solve + STA round; [] once the solver has nothing left to offer.
+
+        With candidates > 1 the top few assignments are checked together
+        (concurrently if the evaluator has evaluate_many, e.g. an STAPool) and
+        every measurement goes back into the solver.
+        """
+        start = time.perf_counter()
+        models = self.candidates(self.count)
+        solve_time = time.perf_counter() - start
+        if not models:
+            return []
+
+        choices = [self.inst.extract_buffers(model) for model in models]
+        files = self.solution_files(len(models))
+        for picked, path in zip(choices, files):
+            write_solution(picked, path=path)
+        start = time.perf_counter()
+        evaluate_many = getattr(self.evaluate, "evaluate_many", None)
+        if evaluate_many is not None:
+            measured = evaluate_many(files)
+        else:
+            measured = [self.evaluate(path) for path in files]
+        sta_time = time.perf_counter() - start
+
+        entries = []
+        for c, (model, picked, (setup, hold)) in enumerate(zip(models, choices, measured)):
+            entries.append({
+                "iteration": self.rounds,
+                "candidate": c,
+                "choices": picked,
+                "predicted": (
+                    float(model.eval(self.inst.slack_setup).as_fraction()),
+                    float(model.eval(self.inst.slack_hold).as_fraction()),
+                ),
+                "measured": (setup, hold),
+                "solve_time": solve_time,
+                "sta_time": sta_time,
+                "repeat": any(entry["choices"] == picked for entry in self.history),
+            })
+            if self.feedback == "bound":
+                self.inst.add_sta_feedback(model, setup, hold)
+            else:
+                self.inst.add_conflict(model)
+        self.rounds += 1
+        self.history.extend(entries)
+        return entries
+
+    def run(self, max_iterations: int = 10) -> Optional[Dict[str, object]]:
+        """Iterate until STA is met; returns the best measured entry."""
+        for _ in range(max_iterations):
+            entries = self.step()
+            if not entries:
+                print("Solver has no further assignment to try.")
+                break
+            for entry in entries:
+                setup, hold = entry["measured"]
+                label = entry["iteration"] if self.count == 1 else f"{entry['iteration']}.{entry['candidate']}"
+                print(
+                    f"[ITER {label}] predicted setup {entry['predicted'][0]:.4f} "
+                    f"hold {entry['predicted'][1]:.4f}, STA setup {setup:.4f} hold {hold:.4f} "
+                    f"(solve {entry['solve_time']:.3f} s, STA {entry['sta_time']:.3f} s)"
+                )
+            if any(min(entry["measured"]) >= 0 for entry in entries):
+                print("STA confirms timing is met.")
+                break
+            if entries[0]["repeat"]:
+                print("Corrected model picked a measured assignment again; it is the best known.")
+                break
+
+        best = self.best()
+        if best is not None:
+            write_solution(best["choices"], path=self.solution_file)
+        return best
+
+    def best(self) -> Optional[Dict[str, object]]:
+        # Timing met first, then the best STA setup slack, then hold
+        if not self.history:
+            return None
+        return max(
+            self.history,
+            key=lambda entry: (min(entry["measured"]) >= 0, entry["measured"][0], entry["measured"][1]),
+        )
+
+    def report(self) -> None:
+        print(f"{'iter':>4} {'cand':>4} {'solve s':>8} {'sta s':>8} {'pred setup':>11} {'sta setup':>10} {'sta hold':>9}")
+        for entry in self.history:
+            print(
+                f"{entry['iteration']:>4} {entry['candidate']:>4} {entry['solve_time']:>8.3f} {entry['sta_time']:>8.3f} "
+                f"{entry['predicted'][0]:>11.4f} {entry['measured'][0]:>10.4f} {entry['measured'][1]:>9.4f}"
+            )
+        print(f"encoding built once in {self.build_time:.3f} s")
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", default="solver_input.json", help="Solver input JSON.")
+    parser.add_argument("--encoding", choices=ENCODINGS, default="pb", help="SMTsolver encoding.")
+    parser.add_argument("--feedback", choices=FEEDBACK, default="bound", help="How STA results go back in.")
+    parser.add_argument("--max-iterations", type=int, default=10, help="Solve/STA rounds at most.")
+    parser.add_argument("--openroad", default=OPENROAD, help="OpenROAD binary (or a stand-in such as fake_sta.py).")
+    parser.add_argument(
+        "--one-shot",
+        action="store_true",
+        help="Start a fresh OpenROAD per candidate instead of one STASession for the whole loop.",
+    )
+    parser.add_argument(
+        "--candidates", type=int, default=1, help="Assignments checked in STA per round (the top K)."
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Persistent STA processes checking candidates concurrently."
+    )
+    parser.add_argument("--sta-timeout", type=float, default=300.0, help="Seconds to wait for each STA command.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> bool:
+    args = parse_args(argv)
+    with open(args.input) as fh:
+        data = json.load(fh)
+    session = None
+    if args.one_shot:
+        evaluate = openroad_evaluator(args.openroad)
+    elif args.workers > 1:
+        session = STAPool(min(args.workers, args.candidates), args.openroad, timeout=args.sta_timeout)
+        print(f"{session.workers} STA workers loaded the design in {session.load_time:.2f} s")
+        evaluate = session
+    else:
+        # The design is loaded once here and reused by every iteration
+        session = STASession(args.openroad, timeout=args.sta_timeout)
+        print(f"STA session loaded the design in {session.load_time:.2f} s")
+        evaluate = session.evaluate
+    try:
+        loop = ClosedLoop(
+            data, evaluate, encoding=args.encoding, feedback=args.feedback, candidates=args.candidates
+        )
+        best = loop.run(args.max_iterations)
+        loop.report()
+    finally:
+        if session is not None:
+            session.close()
+    if best is None:
+        print("Unsatisfiable. No buffer combination meets timing.", file=sys.stderr)
+        return False
+    return min(best["measured"]) >= 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
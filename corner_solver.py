@@ -0,0 +1,48 @@
+import pprint
+
+from joint_solver import JointSolver
+from path_model import expand_corners, has_corners, write_solution
+
+# Multi-corner sizing: one cell per instance, chosen for the worst corner.
+#
+# Input is a solver_input.json whose choices carry per-corner (a, b) (see
+# path_model.corner_input), or a {"paths": [...]} input whose paths do. Every
+# corner of every path becomes an ordinary solver input, and all of them go to
+# JointSolver together. They share slot ids, so each instance is a single
+# decision across the corners, and the "worst" objective maximizes the
+# worst-corner setup slack in one solve, with the same DP seed, bounds and Z3
+# bisection as top-N path sizing. "total" sums the negative slack over every
+# (path, corner) pair instead.
+
+class CornerSolver(JointSolver):
+    def __init__(self, data, objective="worst", tolerance=1e-4, timeout=None):
+        if not has_corners(data):
+            raise ValueError("Multi-corner input needs per-corner a/b (csvtojson.py on --corners rows).")
+        expanded = expand_corners(data)
+        self.labels = [label for label, _ in expanded]
+        super().__init__({"paths": [path for _, path in expanded]},
+                         objective=objective, tolerance=tolerance, timeout=timeout)
+
+    def solve(self):
+        try:
+            print(f" ---- SOLVING ({len(self.labels)} corners, {len(self.slot_ids)} instances) ---- ")
+            choices = self.optimize()
+            self.model = choices
+            print("Found a valid solution!" if self.proven else
+                  "Stopped before the bounds met; keeping the best solution found.")
+
+            slacks = [(float(setup), float(hold)) for setup, hold in self.path_slacks(choices)]
+            for label, (setup, hold) in zip(self.labels, slacks):
+                print(f"  {label}: slack_setup = {setup:.10f}, slack_hold = {hold:.10f}")
+            worst = min(range(len(slacks)), key=lambda c: slacks[c][0])
+            print(f"worst setup slack = {slacks[worst][0]:.10f} ({self.labels[worst]}), "
+                  f"worst hold slack = {min(hold for _, hold in slacks):.10f}")
+
+            print("\nExtracted buffers:")
+            pprint.pprint(choices)
+
+            write_solution(choices, note=f"worst corner: {self.labels[worst]}")
+            return True
+
+        except Exception as e:
+            print(f"An error occurred: {e}")
@@ -1,8 +1,32 @@
-import pandas as pd
 import numpy as np
+import argparse
 import json
+import os
 import re
 import sys
+import time
+from pathlib import Path
+
+import flow_trace
+
+# Per-stage columns; constant for every row of a gate, so read from its first row.
+STAGE_COLUMNS = [
+    'gate_index',
+    'instance_name',
+    'original_cell',
+    'wire_resistance_ohm',
+    'wire_capacitance_fF',
+    'downstream_input_cap_fF',
+]
+
+# Path-level columns; constant for the whole path, so read from the first row.
+TIMING_COLUMNS = [
+    'global_T_period_ps',
+    'global_T_skew_ps',
+    'global_T_setup_ps',
+    'global_T_hold_ps',
+    't_clk_q_max_ps',
+]
 
 def parse_size(cell_name):
     match = re.search(r'_(\d+)$', cell_name)
@@ -13,70 +37,142 @@ def parse_size(cell_name):
 def perform_regression(df_variant):
     X = df_variant['output_capacitance_fF'].values
     y = df_variant['cell_delay_ps'].values
-    
+
     # Fit linear polynomial (deg=1)
     slope, intercept = np.polyfit(X, y, 1)
-    
+
     # Units:
-    # Slope 'a' is ps/fF. 
+    # Slope 'a' is ps/fF.
     # (1 ps / 1 fF) = (1e-12 s) / (1e-15 F) = 1000 Ohm = 1 kOhm.
     # So 'a' in kOhm is exactly the slope value. No conversion needed.
-    
+
     # Intercept 'b' is ps. Convert to ns.
     b_ns = intercept / 1000.0
-    
+
     return slope, b_ns
 
-def main():
-    input_csv = 'critical_path_variants_reg.csv'
-    output_json = 'solver_input.json'
+def batched_regression(group_ids, X, y, n_groups):
+    # Least-squares line for every group at once: one bincount per moment
+    # instead of one np.polyfit per group. Centered sums keep it as well
+    # conditioned as polyfit. Units as in perform_regression.
+    count = np.bincount(group_ids, minlength=n_groups)
+    mean_x = np.bincount(group_ids, X, n_groups) / count
+    mean_y = np.bincount(group_ids, y, n_groups) / count
+    dx = X - mean_x[group_ids]
+    dy = y - mean_y[group_ids]
+    sxx = np.bincount(group_ids, dx * dx, n_groups)
+    sxy = np.bincount(group_ids, dx * dy, n_groups)
 
-    print(f"Reading {input_csv}...")
-    try:
-        df = pd.read_csv(input_csv)
-    except FileNotFoundError:
-        print(f"Error: File {input_csv} not found.")
-        return
+    # A variant swept at a single load has no slope; keep its mean delay.
+    slope = np.divide(sxy, sxx, out=np.zeros(n_groups), where=sxx != 0)
+    intercept = mean_y - slope * mean_x
+    return slope, intercept / 1000.0
+
+def split_columns(columns):
+    # Split flat per-row columns (a DataFrame, or any mapping of column name
+    # to 1-D array) into path timing, per-stage records and the variant sweep.
+    gate_index = np.asarray(columns['gate_index'])
+    _, first_rows, stage_pos = np.unique(gate_index, return_index=True, return_inverse=True)
+
+    timing = {col: columns[col][0] for col in TIMING_COLUMNS}
+
+    stages = []
+    for row in first_rows:
+        stages.append({col: columns[col][row] for col in STAGE_COLUMNS})
 
+    sweep = {
+        'stage': stage_pos.ravel(),
+        'variant_cell': np.asarray(columns['variant_cell']),
+        'output_capacitance_fF': np.asarray(columns['output_capacitance_fF'], dtype=float),
+        'cell_delay_ps': np.asarray(columns['cell_delay_ps'], dtype=float),
+    }
+    if 'variant_area_um2' in columns:
+        sweep['variant_area_um2'] = np.asarray(columns['variant_area_um2'], dtype=float)
+    if 'corner' in columns:
+        sweep['corner'] = np.asarray(columns['corner'])
+    return timing, stages, sweep
+
+def corner_order(sweep):
+    # Corner names in order of first appearance (the analyzer's --corners
+    # order, so the first is the primary corner); [] for single-corner input
+    if 'corner' not in sweep:
+        return []
+    names, first_rows = np.unique(sweep['corner'], return_index=True)
+    return [str(names[i]) for i in np.argsort(first_rows)]
+
+def fit_variants(sweep):
+    # Group rows by (corner, stage, variant) in one pass and fit every line
+    # together. Groups come out sorted by corner, stage, then variant name.
+    # Columnar input already carries variant codes into a sorted name list.
+    if 'variant_code' in sweep:
+        variant_names = sweep['variant_names']
+        variant_codes = sweep['variant_code']
+    else:
+        variant_names, variant_codes = np.unique(sweep['variant_cell'], return_inverse=True)
+    stage = sweep['stage'].astype(np.int64)
+    n_stages = int(stage.max()) + 1 if len(stage) else 0
+    corner_names, corner_codes = [None], np.zeros(len(stage), dtype=np.int64)
+    if 'corner' in sweep:
+        corner_names, corner_codes = np.unique(sweep['corner'], return_inverse=True)
+    keys = (corner_codes.ravel() * n_stages + stage) * len(variant_names) + variant_codes.ravel()
+    group_keys, first_rows, group_ids = np.unique(keys, return_index=True, return_inverse=True)
+    group_ids = group_ids.ravel()
+
+    slope, b_ns = batched_regression(
+        group_ids, sweep['output_capacitance_fF'], sweep['cell_delay_ps'], len(group_keys)
+    )
+    areas = None
+    if 'variant_area_um2' in sweep:
+        areas = sweep['variant_area_um2'][first_rows]
+
+    fits = []
+    for g, key in enumerate(group_keys):
+        corner = corner_names[key // len(variant_names) // n_stages]
+        fits.append({
+            'corner': None if corner is None else str(corner),
+            'stage': int(key // len(variant_names) % n_stages),
+            'variant_cell': str(variant_names[key % len(variant_names)]),
+            'a': slope[g],
+            'b': b_ns[g],
+            'area': None if areas is None else areas[g],
+        })
+    return fits
+
+def build_solver_input(timing, stages, sweep):
     # --- Extract Global Timing ---
-    # Get values from the first row (assuming constant for the path)
-    row0 = df.iloc[0]
+    # Taken from the first row (constant for the path)
     global_timing = {
-        "T_period": row0['global_T_period_ps'] / 1000.0,
-        "T_skew": row0['global_T_skew_ps'] / 1000.0,
-        "T_setup": row0['global_T_setup_ps'] / 1000.0,
-        "T_hold": row0['global_T_hold_ps'] / 1000.0
+        "T_period": timing['global_T_period_ps'] / 1000.0,
+        "T_skew": timing['global_T_skew_ps'] / 1000.0,
+        "T_setup": timing['global_T_setup_ps'] / 1000.0,
+        "T_hold": timing['global_T_hold_ps'] / 1000.0
     }
 
     # --- Build C_in Reference Map ---
     # We use 'downstream_input_cap_fF' from stage i to determine C_in of original cell at stage i+1.
     cin_ref_map = {} # Cell_Name -> Capacitance (fF)
-    
-    sorted_gate_indices = sorted(df['gate_index'].unique())
-    
-    for i in range(len(sorted_gate_indices) - 1):
-        curr_idx = sorted_gate_indices[i]
-        next_idx = sorted_gate_indices[i+1]
-        
-        # Get downstream cap of current stage
-        curr_stage_rows = df[df['gate_index'] == curr_idx]
-        downstream_cap = curr_stage_rows.iloc[0]['downstream_input_cap_fF']
-        
-        # Get original cell name of next stage
-        next_stage_rows = df[df['gate_index'] == next_idx]
-        next_orig_cell = next_stage_rows.iloc[0]['original_cell']
-        
-        cin_ref_map[next_orig_cell] = downstream_cap
+    for curr_stage, next_stage in zip(stages, stages[1:]):
+        cin_ref_map[next_stage['original_cell']] = curr_stage['downstream_input_cap_fF']
+
+    # With a corner column every variant has one fit per corner. The choice
+    # keeps all of them under "corners"; its own a/b are the first corner's,
+    # so single-corner engines still see a complete input.
+    corners = corner_order(sweep)
+    fits_by_stage = [{} for _ in stages]
+    for fit in fit_variants(sweep):
+        fits_by_stage[fit['stage']].setdefault(fit['variant_cell'], {})[fit['corner']] = fit
+
+    if 'variant_area_um2' not in sweep:
+        print("Warning: no variant_area_um2 column; choices will have no area")
 
     # --- Process Stages ---
-    stages = []
+    solver_stages = []
     nets = []
-    
-    for i, gate_idx in enumerate(sorted_gate_indices):
-        stage_df = df[df['gate_index'] == gate_idx]
-        original_cell_name = stage_df.iloc[0]['original_cell']
-        instance_name = stage_df.iloc[0]['instance_name']
-        
+
+    for i, stage in enumerate(stages):
+        original_cell_name = stage['original_cell']
+        instance_name = stage['instance_name']
+
         # Determine Cell Type (Buffer vs Combinational)
         # Simple heuristic: check if "buf" or "dly" is in the name
         is_buffer = "buf" in original_cell_name or "dly" in original_cell_name
@@ -84,58 +180,49 @@ def main():
 
         # --- Determine Baseline C_in for Original Cell ---
         # If we found it in the map, use it.
-        # If not (e.g., first stage), try to find ANY instance of this cell type in map, or estimate.
+        # If not (e.g., first stage), estimate from the drive strength.
         if original_cell_name in cin_ref_map:
             c_in_orig_fF = cin_ref_map[original_cell_name]
         else:
-            # Fallback: Check if we saw this cell type elsewhere
-            if original_cell_name in cin_ref_map:
-                 c_in_orig_fF = cin_ref_map[original_cell_name]
-            else:
-                # Fallback: Estimate based on size (e.g. 1.5fF per size unit)
-                # This mostly applies to the very first gate if it's unique
-                orig_size = parse_size(original_cell_name)
-                c_in_orig_fF = orig_size * 1.5 
-                print(f"Warning: Estimated C_in for {original_cell_name} as {c_in_orig_fF} fF")
+            # Fallback: Estimate based on size (e.g. 1.5fF per size unit)
+            # This mostly applies to the very first gate if it's unique
+            orig_size = parse_size(original_cell_name)
+            c_in_orig_fF = orig_size * 1.5
+            print(f"Warning: Estimated C_in for {original_cell_name} as {c_in_orig_fF} fF")
 
         orig_size = parse_size(original_cell_name)
 
         # --- Process Variants ---
         choices = []
-        # Group by variant_cell to handle the sweep data
-        for variant_name, variant_df in stage_df.groupby('variant_cell'):
-            # create linear regression from scatterplot
-            a_val, b_val = perform_regression(variant_df)
-            
+        for variant_name, corner_fits in fits_by_stage[i].items():
+            if corners and len(corner_fits) < len(corners):
+                print(f"Warning: {variant_name} at {instance_name} is missing from some corners; skipped")
+                continue
+            fit = corner_fits[corners[0] if corners else None]
+
             # scale C_in
             var_size = parse_size(variant_name)
             c_in_variant_fF = c_in_orig_fF * (var_size / orig_size)
 
-            # grab area
-            try:
-                area_val = variant_df.iloc[0]['variant_area_um2']
-                choices.append({
-                    "cell_type": variant_name,
-                    "a": round(a_val, 4), # kOhm
-                    "b": round(b_val, 5), # ns
-                    "C_in": round(c_in_variant_fF / 1000.0, 5), # pF
-                    "area": round(area_val, 5)
-                })
-            except Exception as e:
-                print(f"Failed to retrieve area data: {e}")
-                choices.append({
-                    "cell_type": variant_name,
-                    "a": round(a_val, 4), # kOhm
-                    "b": round(b_val, 5), # ns
-                    "C_in": round(c_in_variant_fF / 1000.0, 5), # pF
-                })
-                continue
-            
-        
+            choice = {
+                "cell_type": variant_name,
+                "a": round(fit['a'], 4), # kOhm
+                "b": round(fit['b'], 5), # ns
+                "C_in": round(c_in_variant_fF / 1000.0, 5), # pF
+            }
+            if fit['area'] is not None:
+                choice["area"] = round(fit['area'], 5)
+            if corners:
+                choice["corners"] = {
+                    corner: {"a": round(corner_fits[corner]['a'], 4), "b": round(corner_fits[corner]['b'], 5)}
+                    for corner in corners
+                }
+            choices.append(choice)
+
         # sort choices by size/name for consistency
         choices.sort(key=lambda x: x['cell_type'])
 
-        stages.append({
+        solver_stages.append({
             "slot_id": instance_name,
             "type": stage_type,
             "choices": choices
@@ -143,12 +230,10 @@ def main():
 
         # --- Build Net ---
         source = instance_name
-        
-        if i < len(sorted_gate_indices) - 1:
+
+        if i < len(stages) - 1:
             # intermediate Net
-            next_gate_idx = sorted_gate_indices[i+1]
-            next_instance = df[df['gate_index'] == next_gate_idx].iloc[0]['instance_name']
-            sink = next_instance
+            sink = stages[i + 1]['instance_name']
             is_terminal = False
         else:
             # final Net
@@ -156,9 +241,9 @@ def main():
             is_terminal = True
 
         # net parasitics (Constant for the stage)
-        wire_res_ohm = stage_df.iloc[0]['wire_resistance_ohm']
-        wire_cap_fF = stage_df.iloc[0]['wire_capacitance_fF']
-        
+        wire_res_ohm = stage['wire_resistance_ohm']
+        wire_cap_fF = stage['wire_capacitance_fF']
+
         net_obj = {
             "net_id": f"net_{source}_to_{sink}",
             "source": source,
@@ -166,32 +251,115 @@ def main():
             "C_wire": round(wire_cap_fF / 1000.0, 5),      # pF
             "R_wire": round(wire_res_ohm / 1000.0, 5)      # kOhm
         }
-        
+
         if is_terminal:
             # Add the fixed downstream cap for the endpoint
-            downstream_fF = stage_df.iloc[0]['downstream_input_cap_fF']
+            downstream_fF = stage['downstream_input_cap_fF']
             net_obj["C_downstream_in"] = round(downstream_fF / 1000.0, 5) # pF
 
         nets.append(net_obj)
 
     # --- Construct Final JSON ---
-    final_json = {
+    solver_input = {
         "global_timing": global_timing,
         "path_data": {
             "fixed_delays": {
                 # taking T_clk_q from the first row
-                "T_clk_q": round(row0['t_clk_q_max_ps'] / 1000.0, 4)
+                "T_clk_q": round(timing['t_clk_q_max_ps'] / 1000.0, 4)
             },
-            "stages": stages,
+            "stages": solver_stages,
             "nets": nets
         }
     }
+    if corners:
+        solver_input["corners"] = corners
+    return solver_input
+
+def compare_with_legacy(df, sweep):
+    # Time the old per-stage filter + per-variant polyfit against the batched
+    # fit and check both give the same rounded (a, b) for every variant.
+    start = time.perf_counter()
+    legacy = {}
+    by_corner = 'corner' in df
+    for stage_pos, gate_idx in enumerate(sorted(df['gate_index'].unique())):
+        stage_df = df[df['gate_index'] == gate_idx]
+        for key, variant_df in stage_df.groupby(['corner', 'variant_cell'] if by_corner else 'variant_cell'):
+            corner, variant_name = key if by_corner else (None, key)
+            legacy[(corner, stage_pos, variant_name)] = perform_regression(variant_df)
+    legacy_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fits = fit_variants(sweep)
+    batched_s = time.perf_counter() - start
+
+    mismatches = 0
+    for fit in fits:
+        a_val, b_val = legacy[(fit['corner'], fit['stage'], fit['variant_cell'])]
+        if (round(a_val, 4), round(b_val, 5)) != (round(fit['a'], 4), round(fit['b'], 5)):
+            mismatches += 1
+    print(f"Regression over {len(df)} rows / {len(fits)} variants: "
+          f"per-stage polyfit {legacy_s * 1e3:.1f} ms, batched {batched_s * 1e3:.1f} ms "
+          f"({legacy_s / batched_s if batched_s else 0.0:.1f}x), {mismatches} mismatching fits")
+    return mismatches == 0
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Convert the variant CSV into solver_input.json.")
+    parser.add_argument('--input', default='critical_path_variants_reg.csv',
+                        help="Variant sweep CSV, or a .cols directory (--format columns), "
+                             "from analyze_critical_path_reg.py.")
+    parser.add_argument('--output', default='solver_input.json',
+                        help="Destination solver input JSON.")
+    parser.add_argument('--compare-legacy', action='store_true',
+                        help="Also run the per-stage polyfit path and report timing and agreement.")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    input_csv = args.input
+    output_json = args.output
+
+    print(f"Reading {input_csv}...")
+    with flow_trace.phase("read_input"):
+        if os.path.isdir(input_csv):
+            # Columnar form: the sweep is memory-mapped, pandas is not needed.
+            from analyze_critical_path import read_columns
+
+            timing, stages, sweep = read_columns(Path(input_csv))
+            df = None
+        else:
+            # pandas is only needed to read the CSV; the builder works on plain arrays.
+            import pandas as pd
+
+            try:
+                df = pd.read_csv(input_csv)
+            except FileNotFoundError:
+                print(f"Error: File {input_csv} not found.")
+                return
+            timing, stages, sweep = split_columns(df)
+    flow_trace.count("stages", len(stages))
+    flow_trace.count("sweep_rows", len(sweep['stage']))
+
+    if args.compare_legacy:
+        if df is None:
+            import pandas as pd
+
+            df = pd.DataFrame({
+                'gate_index': sweep['stage'],
+                'variant_cell': np.asarray(sweep['variant_names'])[sweep['variant_code']],
+                'output_capacitance_fF': sweep['output_capacitance_fF'],
+                'cell_delay_ps': sweep['cell_delay_ps'],
+            })
+        if not compare_with_legacy(df, sweep):
+            sys.exit(1)
+    # Regression of every variant's delay model happens in here
+    with flow_trace.phase("regression"):
+        final_json = build_solver_input(timing, stages, sweep)
 
     # write to file
-    with open(output_json, 'w') as f:
+    with flow_trace.phase("write_json"), open(output_json, 'w') as f:
         json.dump(final_json, f, indent=2)
-    
+
     print(f"Successfully wrote {output_json}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
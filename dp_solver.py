@@ -0,0 +1,110 @@
+import pprint
+
+from path_model import PathModel, write_solution
+
+# Exact sizing for chain paths by dynamic programming over stages.
+#
+# Stage i's delay depends only on the cell picked for stage i and the C_in of
+# the cell picked for stage i+1 (see path_model.py), so the minimum arrival
+# time is a shortest path through one layer of cells per stage:
+#
+#   best[i][j] = min_k delay[i][j][k] + best[i+1][k]
+#
+# which is O(n * k^2) and needs no z3. Minimizing the arrival time maximizes
+# slack_setup, and slack_hold is then fixed, matching SMTsolver's lexicographic
+# objectives. Values stay exact Fractions; ties go to the lowest choice index.
+
+def fastest_picks(path, allowed=None):
+    # Minimum-delay choice index per stage. allowed[i], if given, lists the
+    # choice indices stage i may use (joint_solver restricts shared instances).
+    n = len(path.delay)
+    if allowed is None:
+        allowed = [range(len(table)) for table in path.delay]
+
+    # best[j] / pick_next[i][j]: best remaining delay from stage i as choice j
+    best = {j: path.delay[n - 1][j][0] for j in allowed[n - 1]}
+    pick_next = [None] * n
+    for i in range(n - 2, -1, -1):
+        next_best = best
+        best = {}
+        pick_next[i] = {}
+        for j in allowed[i]:
+            row = path.delay[i][j]
+            k = min(next_best, key=lambda k: row[k] + next_best[k])
+            best[j] = row[k] + next_best[k]
+            pick_next[i][j] = k
+
+    picks = [min(best, key=best.__getitem__)]
+    for i in range(n - 1):
+        picks.append(pick_next[i][picks[-1]])
+    return picks
+
+class DPsolver:
+    def __init__(self, data):
+        self.path = PathModel(data)
+        self.slot_ids = self.path.slot_ids
+        self.model = []
+        self.proven = True  # the DP optimum is exact
+
+    def optimize(self):
+        return fastest_picks(self.path)
+
+    def solve(self):
+        try:
+            print(" ---- SOLVING (DP) ---- ")
+            self.model = self.optimize()
+            print("Found a valid solution!")
+            print(f"slack_setup = {float(self.path.slack_setup(self.model)):.10f}, "
+                  f"slack_hold = {float(self.path.slack_hold(self.model)):.10f}")
+            choices = self.extract_buffers(self.model)
+
+            print("\nExtracted buffers:")
+            pprint.pprint(choices)
+
+            write_solution(choices)
+
+            return True
+
+        except Exception as e:
+            print(f"An error occurred: {e}")
+
+    def extract_buffers(self, model):
+        # model: one choice index per stage, as returned by optimize()
+        return self.path.cells_for(model)
+
+# Delay/area trade-off, for solver_ppa. One label-setting sweep over the same
+# stages keeps, for every (stage, choice), the non-dominated (delay, area)
+# pairs of the rest of the path, so the whole front comes out of one pass
+# instead of one lexicographic Optimize run per trade-off point.
+
+def prune(labels):
+    # Keep labels no other label beats on both delay and area
+    front = []
+    for label in sorted(labels, key=lambda label: (label[0], label[1])):
+        if not front or label[1] < front[-1][1]:
+            front.append(label)
+    return front
+
+def pareto_front(path):
+    # Returns [(delay, area, picks)] sorted by increasing delay / decreasing area
+    n = len(path.delay)
+    if any(area is None for areas in path.area for area in areas):
+        raise ValueError("Pareto front needs an 'area' for every choice.")
+
+    labels = [[(row[0], path.area[n - 1][j], (j,))] for j, row in enumerate(path.delay[n - 1])]
+    for i in range(n - 2, -1, -1):
+        next_labels = labels
+        labels = []
+        for j, row in enumerate(path.delay[i]):
+            labels.append(prune([(row[k] + delay, path.area[i][j] + area, (j,) + picks)
+                                 for k, suffix in enumerate(next_labels)
+                                 for delay, area, picks in suffix]))
+    return [(delay, area, list(picks)) for delay, area, picks in prune(l for ls in labels for l in ls)]
+
+def write_front(path, front, fh):
+    # CSV table, one row per non-dominated point
+    fh.write(",".join(["point", "slack_setup", "slack_hold", "total_area"] + path.slot_ids) + "\n")
+    for point, (_, area, picks) in enumerate(front):
+        values = [f"{float(path.slack_setup(picks)):.10f}", f"{float(path.slack_hold(picks)):.10f}",
+                  f"{float(area):.4f}"]
+        fh.write(",".join([str(point)] + values + [path.choices[i][j] for i, j in enumerate(picks)]) + "\n")
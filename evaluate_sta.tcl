@@ -0,0 +1,17 @@
+# evaluate_sta.tcl
+#
+# One-shot STA check of a buffer solution, used by closed_loop.py:
+#   - Load the design with setup_sta.tcl
+#   - Apply SOLUTION_FILE (default buffers.sol)
+#   - Print "worst slack max <value>" and "worst slack min <value>"
+#
+
+source setup_sta.tcl
+
+set solution_file "buffers.sol"
+if {[info exists ::env(SOLUTION_FILE)]} {
+    set solution_file $::env(SOLUTION_FILE)
+}
+
+apply_buffer_solution $solution_file
+compute_worst_slacks
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Stand-in for OpenROAD when trying sta_session.py without a design.
+
+Reads the commands STASession sends on stdin and answers in the same framing:
+`source` loads nothing, `apply_buffer_solution` records the cells, and
+`compute_worst_slacks` prints "worst slack max/min" computed by PathModel
+from the solver input. Other Tcl commands fail, the way an unknown command
+would in OpenROAD.
+
+    FAKE_STA_INPUT        solver input JSON (default solver_input.json)
+    FAKE_STA_LOAD_DELAY   seconds `source` takes, like reading the design
+    FAKE_STA_CRASH_AFTER  exit abruptly on the Nth compute_worst_slacks
+    FAKE_STA_HANG_AFTER   stop answering on the Nth compute_worst_slacks
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import sys
+import time
+from typing import Dict
+
+from path_model import PathModel
+
+WRAPPED = re.compile(r"^if \{\[catch \{(.*)\} smt_err\]\} \{ puts \"(\S+) \$smt_err\" \}$")
+
+
+def env_count(name: str) -> int:
+    return int(os.environ.get(name, "0") or 0)
+
+
+class FakeSTA:
+    def __init__(self) -> None:
+        with open(os.environ.get("FAKE_STA_INPUT", "solver_input.json")) as fh:
+            self.path = PathModel(json.load(fh))
+        self.cells: Dict[str, str] = dict(self.path.cells_for([0] * len(self.path.slot_ids)))
+        self.checks = 0
+
+    def command(self, command: str) -> None:
+        name, _, arg = command.partition(" ")
+        arg = arg.strip().strip("{}")
+        if name == "source":
+            time.sleep(float(os.environ.get("FAKE_STA_LOAD_DELAY", "0")))
+            print("INFO: Setup complete")
+        elif name == "apply_buffer_solution":
+            with open(arg) as fh:
+                for line in fh:
+                    fields = line.split()
+                    if len(fields) >= 2 and fields[0] in self.cells:
+                        self.cells[fields[0]] = fields[1]
+                        print(f"INFO: replaced {fields[0]} -> {fields[1]}")
+        elif name == "compute_worst_slacks":
+            self.checks += 1
+            if self.checks == env_count("FAKE_STA_CRASH_AFTER"):
+                os._exit(139)
+            if self.checks == env_count("FAKE_STA_HANG_AFTER"):
+                time.sleep(3600)
+            picks = self.path.picks_for(self.cells)
+            print(f"worst slack max {float(self.path.slack_setup(picks)):.4f}")
+            print(f"worst slack min {float(self.path.slack_hold(picks)):.4f}")
+        else:
+            raise ValueError(f'invalid command name "{name}"')
+
+    def serve(self) -> None:
+        for line in sys.stdin:
+            line = line.strip()
+            wrapped = WRAPPED.match(line)
+            if wrapped:
+                try:
+                    self.command(wrapped.group(1))
+                except Exception as exc:
+                    print(f"{wrapped.group(2)} {exc}")
+            elif line.startswith("puts "):
+                print(line[5:].strip('"'))
+            elif line == "flush stdout":
+                sys.stdout.flush()
+            elif line == "exit":
+                break
+            elif line:
+                self.command(line)
+            sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    # OpenROAD flags such as -no_init are accepted and ignored
+    FakeSTA().serve()
@@ -0,0 +1,122 @@
+"""
+Per-phase timers, counters and peak memory for one run of the flow.
+
+Off unless SMT_TRACE is set in the environment or a script's --trace
+option calls enable(). When it is off, phase() returns one shared no-op
+context manager and count() returns at once, so instrumented code pays a
+single flag check.
+
+    with flow_trace.phase("spef"):
+        spef = SpefParser(...)
+    flow_trace.count("rows", len(rows))
+
+Phases nest: a phase opened inside "solve" is recorded as "solve/smt_check".
+Each phase records its wall and CPU seconds, and the process's peak RSS so
+far when it ends (ru_maxrss only grows, so a phase that raised it shows a
+positive peak_rss_delta_mb). At exit the trace is written as JSON to the
+SMT_TRACE path. If that path is a directory, the file goes inside it as
+trace_<script>_<pid>.json, so every process in a make run keeps its own.
+"""
+
+from __future__ import annotations
+
+import atexit
+import contextlib
+import json
+import os
+import resource
+import sys
+import time
+from pathlib import Path
+from typing import ContextManager, Dict, Iterator, List, Optional
+
+ENV_VAR = "SMT_TRACE"
+
+_output: Optional[Path] = None
+_start = 0.0
+_stack: List[str] = []
+_phases: List[Dict[str, object]] = []
+_counters: Dict[str, float] = {}
+_NULL = contextlib.nullcontext()
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def enabled() -> bool:
+    return _output is not None
+
+
+def enable(path: os.PathLike) -> None:
+    """Start tracing this process; the JSON goes to path at exit."""
+    global _output, _start
+    if _output is None:
+        _start = time.perf_counter()
+        atexit.register(write)
+    _output = Path(path)
+
+
+@contextlib.contextmanager
+def _phase(name: str) -> Iterator[None]:
+    _stack.append(name)
+    full_name = "/".join(_stack)
+    rss_before = peak_rss_mb()
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    try:
+        yield
+    finally:
+        rss_after = peak_rss_mb()
+        _phases.append({
+            "name": full_name,
+            "start_s": round(wall - _start, 6),
+            "wall_s": round(time.perf_counter() - wall, 6),
+            "cpu_s": round(time.process_time() - cpu, 6),
+            "peak_rss_mb": round(rss_after, 1),
+            "peak_rss_delta_mb": round(rss_after - rss_before, 1),
+        })
+        _stack.pop()
+
+
+def phase(name: str) -> ContextManager[None]:
+    """Time a block as one phase; a no-op unless tracing is on."""
+    if _output is None:
+        return _NULL
+    return _phase(name)
+
+
+def count(name: str, value: float = 1) -> None:
+    """Add value to a named counter; a no-op unless tracing is on."""
+    if _output is None:
+        return
+    _counters[name] = _counters.get(name, 0) + value
+
+
+def write() -> None:
+    if _output is None:
+        return
+    output = _output
+    if output.is_dir():
+        output = output / f"trace_{Path(sys.argv[0]).stem or 'python'}_{os.getpid()}.json"
+    payload = {
+        "command": sys.argv,
+        "pid": os.getpid(),
+        "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(time.time() - (time.perf_counter() - _start))),
+        "wall_s": round(time.perf_counter() - _start, 6),
+        "cpu_s": round(time.process_time(), 6),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "phases": _phases,
+        "counters": _counters,
+    }
+    try:
+        with output.open("w") as fh:
+            json.dump(payload, fh, indent=1)
+    except OSError as exc:
+        print(f"[WARN] Could not write trace {output}: {exc}", file=sys.stderr)
+
+
+if os.environ.get(ENV_VAR):
+    enable(os.environ[ENV_VAR])
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Generate synthetic solver_input.json problems of any size.
+
+Everything is drawn from a template solver input (example/solver_input.json
+by default), so the numbers look like a real extracted path:
+
+- Each generated stage copies the cell family of a random template stage
+  (buffers, inverters, gates). With K choices, up to K of its real drive
+  strengths are kept. Extra variants are made by jittering real ones.
+  Every a, b, C_in and area is then scaled by a few percent of noise.
+- Net C_wire and R_wire follow a log-normal distribution fitted to the
+  template's nets.
+- T_clk_q, T_setup, T_hold and the skew are the template's. T_period grows
+  with the path, so a long path is about as critical as the template is.
+
+The same (stages, choices, seed) always gives the same problem.
+
+    python3 gen_paths.py --stages 32 --choices 7 --seed 1 --output p32.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+import math
+import random
+import statistics
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+TEMPLATE = Path(__file__).resolve().parent / "example" / "solver_input.json"
+# Relative spread of the per-value noise and of the jittered extra variants
+NOISE = 0.05
+VARIANT_SPREAD = 0.25
+
+
+def log_normal_fit(values: Sequence[float]) -> Tuple[float, float]:
+    logs = [math.log(value) for value in values if value > 0]
+    return statistics.mean(logs), statistics.pstdev(logs) or 0.1
+
+
+def jitter(choice: Dict[str, object], rng: random.Random, spread: float) -> Dict[str, object]:
+    choice = dict(choice)
+    for key in ("a", "b", "C_in", "area"):
+        if key in choice:
+            choice[key] = round(choice[key] * math.exp(rng.gauss(0.0, spread)), 6)
+    return choice
+
+
+def stage_choices(template: Dict[str, object], count: int, rng: random.Random) -> List[Dict[str, object]]:
+    real = list(template["choices"])
+    rng.shuffle(real)
+    picked = real[:count]
+    variant = 0
+    while len(picked) < count:
+        extra = jitter(real[variant % len(real)], rng, VARIANT_SPREAD)
+        extra["cell_type"] = f"{extra['cell_type']}_v{variant // len(real) + 1}"
+        picked.append(extra)
+        variant += 1
+    return sorted((jitter(choice, rng, NOISE) for choice in picked), key=lambda choice: choice["cell_type"])
+
+
+def generate(stages: int, choices: int, seed: int = 0, template_path: Path = TEMPLATE) -> Dict[str, object]:
+    if stages < 1 or choices < 1:
+        raise ValueError("Need at least one stage and one choice per stage.")
+    with template_path.open() as fh:
+        template = json.load(fh)
+    rng = random.Random(seed)
+    template_stages = template["path_data"]["stages"]
+    template_nets = template["path_data"]["nets"]
+    c_wire = log_normal_fit([net["C_wire"] for net in template_nets])
+    r_wire = log_normal_fit([net["R_wire"] for net in template_nets])
+    c_sink = template_nets[-1].get("C_downstream_in", 0.0018)
+
+    path_stages = []
+    for i in range(stages):
+        source = rng.choice(template_stages)
+        path_stages.append({
+            "slot_id": f"g{i}",
+            "type": source.get("type", "buffer"),
+            "choices": stage_choices(source, choices, rng),
+        })
+
+    nets = []
+    for i, stage in enumerate(path_stages):
+        last = i == stages - 1
+        sink = "sink_pin" if last else path_stages[i + 1]["slot_id"]
+        net = {
+            "net_id": f"net_{stage['slot_id']}_to_{sink}",
+            "source": stage["slot_id"],
+            "sink": sink,
+            "C_wire": round(rng.lognormvariate(*c_wire), 6),
+            "R_wire": round(rng.lognormvariate(*r_wire), 6),
+        }
+        if last:
+            net["C_downstream_in"] = c_sink
+        nets.append(net)
+
+    timing = copy.deepcopy(template["global_timing"])
+    fixed = copy.deepcopy(template["path_data"]["fixed_delays"])
+    # Keep the part of the period spent in the stages proportional to length
+    stage_time = timing["T_period"] - fixed["T_clk_q"]
+    timing["T_period"] = round(fixed["T_clk_q"] + stage_time * stages / len(template_stages), 6)
+    return {"global_timing": timing, "path_data": {"fixed_delays": fixed, "stages": path_stages, "nets": nets}}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stages", type=int, required=True, help="Stages on the path (N).")
+    parser.add_argument("--choices", type=int, default=7, help="Cell choices per stage (K).")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+    parser.add_argument("--template", type=Path, default=TEMPLATE, help="Solver input to draw values from.")
+    parser.add_argument("--output", type=Path, default=Path("solver_input.json"), help="Output JSON.")
+    args = parser.parse_args()
+
+    data = generate(args.stages, args.choices, args.seed, args.template)
+    with args.output.open("w") as fh:
+        json.dump(data, fh, indent=1)
+    print(f"Wrote {args.stages} stage(s) x {args.choices} choice(s) (seed {args.seed}) to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
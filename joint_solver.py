@@ -0,0 +1,271 @@
+from fractions import Fraction
+from z3 import *
+import pprint
+
+from dp_solver import fastest_picks
+from path_model import PathModel, write_solution
+from solver import z3_const
+
+# Joint sizing of several register-to-register paths that share instances.
+#
+# Input is {"paths": [solver_input, ...]}, one solver_input.json payload per
+# path (see pipeline.py). Slot ids are instance names, so an instance that
+# sits on several paths gets a single decision across all of them, limited to
+# the cells every one of its paths offers.
+#
+# Each path is encoded as in SMTsolver's "pb" encoding: the stage delay is
+# bounded from below by the constant of the (cell, next cell) pair picked.
+# Top-N paths mostly share prefixes and suffixes, so a stage whose driver,
+# sink and delay table already appeared on another path reuses that path's
+# D_stage variable instead of adding its pair constraints again.
+#
+# Objectives (setup slack, per path):
+#   worst  maximize the worst slack
+#   total  maximize the total negative slack, sum of min(slack, 0)
+#
+# Optimize() stalls on a few dozen paths, so the objective is bracketed
+# instead. The lower bound comes from a seed assignment: every path's own DP
+# optimum, most critical path first, then coordinate descent over instances.
+# The upper bound sizes every path on its own, ignoring the sharing. Z3 then
+# bisects the gap with a plain Solver, tightening the lower bound on every
+# sat answer, until it is within `tolerance` ns. The Z3 encoding is only
+# built if the seed does not already meet the upper bound. With `timeout`
+# (seconds per check) the search can stop early; it then keeps the best
+# assignment so far and reports both bounds.
+
+OBJECTIVES = ("worst", "total")
+
+class JointSolver:
+    def __init__(self, data, objective="worst", tolerance=1e-4, timeout=None):
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Unknown objective '{objective}', expected one of {OBJECTIVES}")
+        if not data.get('paths'):
+            raise ValueError("Joint input needs a non-empty 'paths' list.")
+        self.objective = objective
+        self.tolerance = Fraction(str(tolerance))
+        self.timeout = timeout
+        self.paths = [PathModel(path_data) for path_data in data['paths']]
+
+        # Cells allowed per instance: offered on every path through it
+        self.cells = {}
+        self.paths_through = {}
+        for p, path in enumerate(self.paths):
+            for slot_id, choices in zip(path.slot_ids, path.choices):
+                if slot_id in self.cells:
+                    self.cells[slot_id] = [cell for cell in self.cells[slot_id] if cell in choices]
+                else:
+                    self.cells[slot_id] = list(choices)
+                self.paths_through.setdefault(slot_id, []).append(p)
+        for slot_id, cells in self.cells.items():
+            if not cells:
+                raise ValueError(f"Instance '{slot_id}' has no cell that is a choice on all of its paths.")
+        self.slot_ids = list(self.cells)
+
+        self.solver = None
+        self.decision_vars = {}
+        self.stage_vars = {}
+        self.model = []
+        self.bounds = None
+        self.proven = False
+
+    def encode(self):
+        self.solver = Solver()
+        if self.timeout:
+            self.solver.set("timeout", int(self.timeout * 1000))
+
+        # One decision per (instance, cell), shared by every path
+        for slot_id, cells in self.cells.items():
+            for cell_name in cells:
+                self.decision_vars[(slot_id, cell_name)] = Bool(f"S_{slot_id}_{cell_name}")
+            self.solver.add(PbEq([(self.decision_vars[(slot_id, cell)], 1) for cell in cells], 1))
+
+        # Stage delays, deduplicated across paths
+        slacks = []
+        for p, path in enumerate(self.paths):
+            D_path = [self.stage_delay(path, i) for i in range(len(path.slot_ids))]
+            slack_setup = Real(f"slack_setup_{p}")
+            self.solver.add(slack_setup == z3_const(path.rat_setup - path.t_clk_q) - Sum(D_path))
+            slacks.append(slack_setup)
+
+        if self.objective == "worst":
+            self.goal = Real("worst_slack")
+            for slack in slacks:
+                self.solver.add(self.goal <= slack)
+        else:
+            negative = []
+            for p, slack in enumerate(slacks):
+                neg = Real(f"neg_slack_{p}")
+                self.solver.add(neg <= 0, neg <= slack)
+                negative.append(neg)
+            self.goal = Real("total_negative_slack")
+            self.solver.add(self.goal == Sum(negative))
+
+    def stage_delay(self, path, i):
+        # D_stage variable for stage i of path, shared with identical stages
+        slot_id = path.slot_ids[i]
+        is_last = i == len(path.slot_ids) - 1
+        next_id = None if is_last else path.slot_ids[i + 1]
+        pairs = []
+        for j, row in enumerate(path.delay[i]):
+            cell = path.choices[i][j]
+            if cell not in self.cells[slot_id]:
+                continue
+            for k, delay in enumerate(row):
+                next_cell = None if is_last else path.choices[i + 1][k]
+                if next_cell is not None and next_cell not in self.cells[next_id]:
+                    continue
+                pairs.append((cell, next_cell, delay))
+
+        key = (slot_id, next_id, tuple(pairs))
+        if key in self.stage_vars:
+            return self.stage_vars[key]
+
+        D = Real(f"D_stage_{slot_id}_{len(self.stage_vars)}")
+        self.solver.add(D >= z3_const(min(delay for _, _, delay in pairs)))
+        for cell, next_cell, delay in pairs:
+            chosen = self.decision_vars[(slot_id, cell)]
+            if next_cell is not None:
+                chosen = And(chosen, self.decision_vars[(next_id, next_cell)])
+            self.solver.add(Implies(chosen, D >= z3_const(delay)))
+        self.stage_vars[key] = D
+        return D
+
+    def allowed(self, path):
+        # Choice indices per stage that the shared instances allow
+        return [[j for j, cell in enumerate(choices) if cell in self.cells[slot_id]]
+                for slot_id, choices in zip(path.slot_ids, path.choices)]
+
+    def path_slacks(self, choices):
+        # Exact (setup, hold) slack of every path for {slot_id: cell_type}
+        slacks = []
+        for path in self.paths:
+            picks = path.picks_for(choices)
+            slacks.append((path.slack_setup(picks), path.slack_hold(picks)))
+        return slacks
+
+    def score(self, setup):
+        # Objective value of a list of per-path setup slacks
+        if self.objective == "worst":
+            return min(setup)
+        return sum(min(slack, 0) for slack in setup)
+
+    def seed(self):
+        # DP optimum of each path on its own (also the upper bound), then
+        # fixed instances most critical path first
+        own = [fastest_picks(path, self.allowed(path)) for path in self.paths]
+        own_slack = [path.slack_setup(picks) for path, picks in zip(self.paths, own)]
+        upper = self.score(own_slack)
+
+        choices = {}
+        for p in sorted(range(len(self.paths)), key=own_slack.__getitem__):
+            for slot_id, cell in self.paths[p].cells_for(own[p]).items():
+                choices.setdefault(slot_id, cell)
+
+        # Coordinate descent in floats, re-timing only the paths through the
+        # instance that changes; ties in the objective go to the other one
+        tables = [[[[float(d) for d in row] for row in table] for table in path.delay] for path in self.paths]
+        picks = [path.picks_for(choices) for path in self.paths]
+
+        def slack_of(p):
+            path = self.paths[p]
+            n = len(picks[p])
+            return float(path.rat_setup - path.t_clk_q) - sum(
+                tables[p][i][picks[p][i]][picks[p][i + 1] if i < n - 1 else 0] for i in range(n))
+
+        def key(setup):
+            worst = min(setup)
+            total = sum(min(slack, 0.0) for slack in setup)
+            return (worst, total) if self.objective == "worst" else (total, worst)
+
+        setup = [slack_of(p) for p in range(len(self.paths))]
+        improved = True
+        while improved:
+            improved = False
+            for slot_id in self.slot_ids:
+                through = self.paths_through[slot_id]
+                best_cell, best_key = choices[slot_id], key(setup)
+                for cell in self.cells[slot_id]:
+                    if cell == choices[slot_id]:
+                        continue
+                    trial = list(setup)
+                    for p in through:
+                        stage = self.paths[p].slot_ids.index(slot_id)
+                        old = picks[p][stage]
+                        picks[p][stage] = self.paths[p].choices[stage].index(cell)
+                        trial[p] = slack_of(p)
+                        picks[p][stage] = old
+                    if key(trial) > best_key:
+                        best_cell, best_key = cell, key(trial)
+                if best_cell != choices[slot_id]:
+                    choices[slot_id] = best_cell
+                    for p in through:
+                        stage = self.paths[p].slot_ids.index(slot_id)
+                        picks[p][stage] = self.paths[p].choices[stage].index(best_cell)
+                        setup[p] = slack_of(p)
+                    improved = True
+        return choices, upper
+
+    def optimize(self):
+        # Returns {slot_id: cell_type}; sets self.bounds and self.proven
+        best, upper = self.seed()
+        lower = self.score([slack for slack, _ in self.path_slacks(best)])
+        print(f"Seed objective {float(lower):.10f}, upper bound {float(upper):.10f}")
+        if upper - lower > self.tolerance and self.solver is None:
+            self.encode()
+            print(f"Encoded {len(self.decision_vars)} decisions, {len(self.stage_vars)} stage delays")
+
+        # A timed-out check retries with a smaller step above the lower
+        # bound, which is easier to satisfy; three in a row end the search
+        step = Fraction(1, 2)
+        while upper - lower > self.tolerance and step > Fraction(1, 16):
+            mid = lower + (upper - lower) * step
+            self.solver.push()
+            self.solver.add(self.goal >= z3_const(mid))
+            result = self.solver.check()
+            if result == sat:
+                best = self.extract_buffers(self.solver.model())
+                lower = self.score([slack for slack, _ in self.path_slacks(best)])
+                step = Fraction(1, 2)
+            elif result == unsat:
+                upper = mid
+                step = Fraction(1, 2)
+            else:
+                step /= 2
+            self.solver.pop()
+            print(f"  {result}: {self.objective} slack in [{float(lower):.10f}, {float(upper):.10f}]")
+
+        self.bounds = (lower, upper)
+        self.proven = upper - lower <= self.tolerance
+        return best
+
+    def solve(self):
+        try:
+            print(f" ---- SOLVING ({len(self.paths)} paths, {len(self.slot_ids)} instances) ---- ")
+            choices = self.optimize()
+            self.model = choices
+            print("Found a valid solution!" if self.proven else
+                  "Stopped before the bounds met; keeping the best solution found.")
+
+            setup = [float(slack) for slack, _ in self.path_slacks(choices)]
+            print(f"worst setup slack = {min(setup):.10f}, "
+                  f"total negative slack = {sum(min(s, 0.0) for s in setup):.10f}, "
+                  f"failing paths = {sum(s < 0 for s in setup)}/{len(setup)}")
+
+            print("\nExtracted buffers:")
+            pprint.pprint(choices)
+
+            write_solution(choices)
+
+            return True
+
+        except Exception as e:
+            print(f"An error occurred: {e}")
+
+    def extract_buffers(self, model):
+        choices = {}
+        for (slot_id, cell_name), z3_var in self.decision_vars.items():
+            # check if Z3 set this variable to True
+            if is_true(model[z3_var]):
+                choices[slot_id] = cell_name
+
+        return choices
@@ -0,0 +1,241 @@
+"""
+Single-pass Liberty reader.
+
+The regex helpers in analyze_critical_path.py locate each group with a regex
+and then copy it out with extract_block(), so every nesting level re-scans
+(and re-slices) the text of its parent. This module tokenizes the buffer once,
+left to right, and tracks group nesting on a small stack. Only the groups the
+timing flow needs are materialized:
+
+    cell -> pin -> timing -> cell_rise / cell_fall / rise_transition / fall_transition
+
+Everything else (pg_pin, internal_power, leakage_power, templates, ...) is
+tokenized and dropped. The result uses the same pin/timing/table dict layout
+as parse_pins() so LibertyCell and TimingArc work unchanged.
+
+The reader works on bytes-like buffers (bytes or mmap) so it can be pointed at
+a single cell group at a known byte offset.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Container, Dict, List, Optional, Tuple
+
+TIMING_TABLES = ("cell_rise", "cell_fall", "rise_transition", "fall_transition")
+
+# One token per match; group 1 = quoted string, 2 = punctuation, 3 = bare word.
+# Comments and line-continuation backslashes match with no group set.
+_TOKEN_RE = re.compile(
+    rb'\s*(?:/\*.*?\*/|"((?:[^"\\]|\\.)*)"|([{}();:,])|\\|([^\s{}();:,"\\]+))',
+    re.DOTALL,
+)
+
+# Skipped groups are matched by brace counting alone, like extract_block().
+_BRACE_RE = re.compile(rb"[{}]")
+
+# Frame kinds on the group stack.
+_LIBRARY = 0
+_CELL = 1
+_BUS = 2
+_PIN = 3
+_TIMING = 4
+_TABLE = 5
+_OTHER = 6
+_SKIP = 7  # a cell already defined by an earlier lib
+
+_BUS_GROUPS = ("bus", "bundle")
+
+CellData = Tuple[Dict[str, Dict[str, object]], Optional[float]]
+
+
+def _floats(text: str) -> List[float]:
+    return [float(tok) for tok in text.replace(",", " ").split()]
+
+
+def _to_float(text: str) -> Optional[float]:
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def parse_cells(
+    buf,
+    start: int = 0,
+    end: Optional[int] = None,
+    skip: Container[str] = (),
+    limit: Optional[int] = None,
+) -> Dict[str, CellData]:
+    """Parse cell groups from buf[start:end] in a single linear scan.
+
+    Returns {cell_name: (pins, area)} in file order. Cells whose name is in
+    `skip` are scanned past without building anything (first-wins merging
+    across libs). Parsing stops after `limit` cells when given, which lets a
+    caller parse exactly one cell starting at its byte offset.
+    """
+    cells: Dict[str, CellData] = {}
+    if end is None:
+        end = len(buf)
+    stack: List[Tuple[int, object]] = []
+    top = None
+    # Tokens of the statement being assembled: text values, punctuation as bytes.
+    stmt: List[object] = []
+    closed_args = False
+    done = 0
+    pos = start
+    token_match = _TOKEN_RE.match
+
+    while True:
+        match = token_match(buf, pos, end)
+        if match is None:
+            break
+        pos = match.end()
+        string, punct, word = match.groups()
+        if punct is None:
+            if string is not None:
+                tok = string.decode("latin-1")
+            elif word is not None:
+                tok = word.decode("latin-1")
+            else:
+                continue
+            # A statement missing its trailing ';' ends when the next one starts.
+            if closed_args or (len(stmt) == 3 and stmt[1] == b":"):
+                _attribute(top, stack, stmt)
+                stmt = []
+                closed_args = False
+            stmt.append(tok)
+            continue
+
+        if punct == b";":
+            _attribute(top, stack, stmt)
+            stmt = []
+            closed_args = False
+        elif punct == b"{":
+            kind, payload = _open_group(top, stack, stmt, skip)
+            stmt = []
+            closed_args = False
+            if kind == _OTHER or kind == _SKIP:
+                # Nothing inside is needed: jump straight past the closing brace.
+                pos = _skip_group(buf, pos, end)
+                if kind == _SKIP and top in (None, _LIBRARY):
+                    done += 1
+                    if limit is not None and done >= limit:
+                        break
+                continue
+            stack.append((kind, payload))
+            top = kind
+        elif punct == b"}":
+            if stmt:
+                _attribute(top, stack, stmt)
+                stmt = []
+                closed_args = False
+            if not stack:
+                break
+            kind, payload = stack.pop()
+            top = stack[-1][0] if stack else None
+            if kind == _CELL:
+                name, pins, area = payload
+                cells.setdefault(name, (pins, area))
+            elif kind == _PIN:
+                name, info = payload
+                stack[-1][1][1][name] = info
+            elif kind == _TIMING:
+                stack[-1][1][1]["timing"].append(payload)
+            elif kind == _TABLE:
+                name, table = payload
+                if table.get("index_1") and table.get("index_2") and table.get("values"):
+                    stack[-1][1].setdefault(name, table)
+            if kind == _CELL and top in (None, _LIBRARY):
+                done += 1
+                if limit is not None and done >= limit:
+                    break
+        else:
+            if punct == b")":
+                closed_args = True
+            elif closed_args:
+                _attribute(top, stack, stmt)
+                stmt = []
+                closed_args = False
+            stmt.append(punct)
+    return cells
+
+
+def _skip_group(buf, pos: int, end: int) -> int:
+    """Return the offset just past the '}' closing the group opened before pos."""
+    depth = 1
+    for match in _BRACE_RE.finditer(buf, pos, end):
+        char = match.group()
+        if char == b"{":
+            depth += 1
+        elif char == b"}":
+            depth -= 1
+            if depth == 0:
+                return match.end()
+    return end
+
+
+def _group_args(stmt: List[object]) -> List[str]:
+    return [tok for tok in stmt[2:] if isinstance(tok, str)]
+
+
+def _open_group(top, stack, stmt: List[object], skip: Container[str]):
+    name = stmt[0] if stmt and isinstance(stmt[0], str) else ""
+    args = _group_args(stmt)
+    arg = args[0] if args else ""
+    if top is None or top == _LIBRARY:
+        if name == "cell":
+            if arg in skip:
+                return _SKIP, None
+            return _CELL, [arg, {}, None]
+        if name == "library":
+            return _LIBRARY, None
+        return _OTHER, None
+    if top in (_CELL, _BUS):
+        if name == "pin":
+            return _PIN, (arg, {"timing": []})
+        if name in _BUS_GROUPS:
+            cell_pins = stack[-1][1][1]
+            return _BUS, (None, cell_pins)
+        return _OTHER, None
+    if top == _PIN and name == "timing":
+        return _TIMING, {}
+    if top == _TIMING and name in TIMING_TABLES:
+        return _TABLE, (name, {})
+    return _OTHER, None
+
+
+def _attribute(top, stack, stmt: List[object]) -> None:
+    if top not in (_CELL, _PIN, _TIMING, _TABLE) or len(stmt) < 3:
+        return
+    name = stmt[0]
+    payload = stack[-1][1]
+    if stmt[1] == b":":
+        value = stmt[2]
+        if not isinstance(value, str):
+            return
+        if top == _CELL:
+            if name == "area" and payload[2] is None:
+                payload[2] = _to_float(value)
+        elif top == _PIN:
+            info = payload[1]
+            if name == "capacitance" and "capacitance" not in info:
+                cap = _to_float(value)
+                if cap is not None:
+                    info["capacitance"] = cap
+            elif name == "direction" and "direction" not in info:
+                direction = value.lower()
+                if direction in ("input", "output", "inout"):
+                    info["direction"] = direction
+        elif top == _TIMING:
+            if name in ("related_pin", "timing_type") and name not in payload:
+                payload[name] = value
+    elif stmt[1] == b"(" and top == _TABLE:
+        table = payload[1]
+        args = _group_args(stmt)
+        if not args or name in table:
+            return
+        if name in ("index_1", "index_2"):
+            table[name] = _floats(args[0])
+        elif name == "values":
+            table[name] = [_floats(row) for row in args]
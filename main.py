@@ -1,34 +1,180 @@
-from solver import *
 import subprocess
 import json
 
+import flow_trace
+from path_model import has_corners
+
 OpenROAD = "../../tools/install/OpenROAD/bin/openroad"
 
-# grab data values
-with open("solver_input.json", "r") as f:
-    data = json.load(f)
+ENGINES = ("z3", "dp", "portfolio")
+
+def solve(input_path="solver_input.json", encoding="lra", engine="z3", objective="worst", timeout=None,
+          time_budget=None, use_cache=True, cache_dir=None, stats_file=None):
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}', expected one of {ENGINES}")
+
+    # grab data values
+    with flow_trace.phase("load_input"), open(input_path, "r") as f:
+        data = json.load(f)
+
+    # Proven results are cached by input content and solver mode (solve_cache.py)
+    from solve_cache import DEFAULT_CACHE_DIR, SolveCache
+    cache = SolveCache(cache_dir or DEFAULT_CACHE_DIR) if use_cache else None
+    if has_corners(data):
+        mode = {"engine": "corners", "objective": objective}
+    elif 'paths' in data:
+        mode = {"engine": "joint", "objective": objective}
+    else:
+        mode = {"engine": engine, "encoding": encoding if engine == "z3" else None}
+    if cache and stats_file:
+        # Statistics describe a solver run; a cached answer has none to give
+        print(f"Solving without a solve cache lookup so {stats_file} can be written")
+    elif cache:
+        with flow_trace.phase("cache_lookup"):
+            hit = cache.load(data, mode)
+        flow_trace.count("cache_hits" if hit is not None else "cache_misses")
+        if hit is not None:
+            print("Solve cache hit: " + ", ".join(f"{name} = {value:.10f}" for name, value in hit["objectives"].items()))
+            with open("buffers.sol", "w") as f:
+                f.write(hit["solution"])
+            return True
+
+    with flow_trace.phase("solve"):
+        inst, SAT = run_engine(data, encoding, engine, objective, timeout, time_budget)
+    if stats_file:
+        # Problem size, Z3 statistics and objective bounds (SMTsolver.stats)
+        if getattr(inst, "stats", None) is not None:
+            inst.write_stats(stats_file)
+            print(f"Wrote solver statistics to {stats_file}")
+        else:
+            print(f"No solver statistics for this engine; {stats_file} not written.")
+
+    if SAT and cache and inst.proven:
+        with open("buffers.sol", "r") as f:
+            solution = f.read()
+        cache.store(data, mode, solution, objective_values(data, solution))
+    return SAT
+
+def run_engine(data, encoding, engine, objective, timeout, time_budget):
+    # Builds the solver for data and runs it; returns (instance, solve() result)
+    if has_corners(data):
+        # Per-corner a/b from csvtojson.py, sized for the worst corner
+        from corner_solver import CornerSolver
+        print("Setting up multi-corner solver")
+        inst = CornerSolver(data, objective=objective, timeout=timeout)
+        SAT = inst.solve()
+    elif 'paths' in data:
+        # Top-N paths from pipeline.py --paths-json, sized jointly
+        from joint_solver import JointSolver
+        print(f"Setting up joint solver for {len(data['paths'])} paths")
+        inst = JointSolver(data, objective=objective, timeout=timeout)
+        SAT = inst.solve()
+    elif engine == "portfolio":
+        # Race engine configurations in separate processes; timeout is the deadline
+        from portfolio import PortfolioSolver
+        print("Setting up solver portfolio")
+        inst = PortfolioSolver(data, deadline=timeout or 60.0)
+        SAT = inst.solve()
+    elif engine == "dp":
+        # Exact chain-path DP, no z3 needed
+        from dp_solver import DPsolver
+        print("Setting up DP solver")
+        inst = DPsolver(data)
+        SAT = inst.solve()
+    else:
+        # z3 is heavy to import; only load it when we actually solve
+        from solver import SMTsolver
+
+        # Creating SMT instance
+        print("Setting up SMT solver")
+        inst = SMTsolver(data, encoding=encoding)
 
-# Creating SMT instance
-print("Setting up SMT solver")
-SMT_inst = SMTsolver(data)
+        # Outputs chosen buffer sizes to buffer.sol
+        print("Running solve() on SMT_inst")
+        SAT = inst.solve(time_budget=time_budget)
+    return inst, SAT
 
-# Outputs chosen buffer sizes to buffer.sol
-print("Running solve() on SMT_inst")
-SAT = SMT_inst.solve()
+def objective_values(data, solution):
+    # Exact slacks of a buffers.sol text, as stored with a cache entry
+    from path_model import PathModel, expand_corners
 
-# If SAT 
-#   run apply_buffers
-# else
-#   No valid solution
-if SAT:
+    choices = dict(line.split()[:2] for line in solution.splitlines() if line.strip() and not line.startswith("#"))
+    if has_corners(data):
+        setup, hold = [], []
+        for _, corner_data in expand_corners(data):
+            path = PathModel(corner_data)
+            picks = path.picks_for(choices)
+            setup.append(float(path.slack_setup(picks)))
+            hold.append(float(path.slack_hold(picks)))
+        return {"worst_setup_slack": min(setup), "worst_hold_slack": min(hold),
+                "total_negative_slack": sum(min(slack, 0.0) for slack in setup)}
+    if 'paths' not in data:
+        path = PathModel(data)
+        picks = path.picks_for(choices)
+        return {"slack_setup": float(path.slack_setup(picks)), "slack_hold": float(path.slack_hold(picks))}
+    setup = []
+    for path_data in data['paths']:
+        path = PathModel(path_data)
+        setup.append(float(path.slack_setup(path.picks_for(choices))))
+    return {"worst_setup_slack": min(setup), "total_negative_slack": sum(min(slack, 0.0) for slack in setup)}
+
+def pareto(input_path="solver_input.json", output_path="pareto.csv"):
+    # Whole delay/area front in one DP sweep, instead of rerunning solver_ppa
+    from dp_solver import pareto_front, write_front
+    from path_model import PathModel
+
+    with open(input_path, "r") as f:
+        data = json.load(f)
+
+    path = PathModel(data)
+    front = pareto_front(path)
+    with open(output_path, "w") as f:
+        write_front(path, front, f)
+    print(f"Wrote {len(front)} non-dominated delay/area point(s) to {output_path}")
+    return front
+
+def apply_solution(openroad=OpenROAD):
     # Grabs values from buffer.sol
     # runs apply_buffer_solution
     # then runs timing slack with new buffers
     # creates new odb file
-    print("STA output has optimal slack")
     subprocess.run(
-        [OpenROAD, "-exit", "apply_smt_buffers.tcl"],
+        [openroad, "-exit", "apply_smt_buffers.tcl"],
         check=True
     )
-else:
-    print("Unsatisfiable. No buffer combination meets timing.")
\ No newline at end of file
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Solve solver_input.json and apply the result in OpenROAD.")
+    parser.add_argument("--engine", choices=ENGINES, default="z3", help="z3 (SMTsolver), dp (exact chain DP) or portfolio (race Z3 configurations).")
+    parser.add_argument("--encoding", choices=("lra", "pb"), default="lra", help="SMTsolver encoding.")
+    parser.add_argument("--objective", choices=("worst", "total"), default="worst", help="Multi-path/multi-corner objective.")
+    parser.add_argument("--timeout", type=float, default=None, help="Multi-path/multi-corner: seconds per Z3 check; portfolio: deadline.")
+    parser.add_argument("--time-budget", type=float, default=None,
+                        help="z3: stop after this many seconds with the best solution so far.")
+    parser.add_argument("--no-cache", action="store_true", help="Always solve, ignoring .solve_cache.")
+    parser.add_argument("--stats", default=None,
+                        help="z3: write assertion/variable counts, Z3 statistics and objective bounds as JSON "
+                             "(always solves; the result is still cached).")
+    parser.add_argument("--trace", default=None,
+                        help="Write per-phase timing/memory JSON here (a file or a directory); also SMT_TRACE.")
+    args = parser.parse_args()
+    if args.trace:
+        flow_trace.enable(args.trace)
+
+    SAT = solve(encoding=args.encoding, engine=args.engine, objective=args.objective, timeout=args.timeout,
+                time_budget=args.time_budget, use_cache=not args.no_cache, stats_file=args.stats)
+
+    # If SAT
+    #   run apply_buffers
+    # else
+    #   No valid solution
+    if SAT:
+        print("STA output has optimal slack")
+        with flow_trace.phase("apply"):
+            apply_solution()
+    else:
+        print("Unsatisfiable. No buffer combination meets timing.")
+
+if __name__ == "__main__":
+    main()
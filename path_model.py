@@ -0,0 +1,142 @@
+from fractions import Fraction
+
+# Exact constants for a chain path, without z3.
+#
+# In solver.py a stage's delay depends only on the cell picked for that stage
+# and the C_in of the cell picked for the next one:
+#
+#   D_i(j, k) = a_j * (C_wire_i + C_in_k) + b_j + R_wire_i * (C_wire_i / 2 + C_in_k)
+#
+# so the whole path reduces to one delay table per stage. Values are kept as
+# Fractions and built the way z3 sees them: Python floats become the decimal
+# numeral str(value), and arithmetic that solver.py does on plain floats
+# (e.g. the terminal net) is done on floats first. That keeps totals exactly
+# equal to what the Z3 encoding computes.
+
+def exact(value):
+    return Fraction(str(value))
+
+class PathModel:
+    def __init__(self, data):
+        stages = data['path_data']['stages']
+        nets = data['path_data']['nets']
+
+        self.slot_ids = [stage['slot_id'] for stage in stages]
+        slot_index = {slot_id: i for i, slot_id in enumerate(self.slot_ids)}
+        self.choices = [[choice['cell_type'] for choice in stage['choices']] for stage in stages]
+        self.c_in = [[exact(choice['C_in']) for choice in stage['choices']] for stage in stages]
+        self.area = [[exact(choice['area']) if 'area' in choice else None for choice in stage['choices']]
+                     for stage in stages]
+
+        # delay[i][j][k]: stage i as choice j driving stage i+1 as choice k.
+        # The last stage drives the capture flop, so it has a single column.
+        nets_by_source = {net['source']: net for net in nets}
+        self.delay = []
+        for i, stage in enumerate(stages):
+            slot_id = stage['slot_id']
+            if slot_id not in nets_by_source:
+                raise ValueError(f"Error: Slot '{slot_id}' is not listed as a source for any net.")
+            net = nets_by_source[slot_id]
+            is_last = i == len(stages) - 1
+
+            # Output load seen by the cell (C_out in solver.py)
+            if 'C_downstream_in' in net:
+                c_out = [exact(net['C_wire'] + net['C_downstream_in'])]
+            elif net['sink'] in slot_index:
+                if is_last or slot_index[net['sink']] != i + 1:
+                    raise ValueError(f"Path is not a chain: net from '{slot_id}' drives '{net['sink']}'.")
+                c_out = [exact(net['C_wire']) + c_in for c_in in self.c_in[i + 1]]
+            else:
+                raise ValueError(f"Connectivity Error: Net from '{slot_id}' drives '{net['sink']}', "
+                                 f"but '{net['sink']}' is not a known buffer/gate slot and no fixed C_downstream_in was provided.")
+
+            # Elmore wire delay (D_net in solver.py, which indexes nets by position)
+            net_data = nets[i]
+            if is_last:
+                d_net = [exact(net_data['R_wire'] * (net_data['C_wire'] / 2.0 + net_data['C_downstream_in']))]
+            else:
+                half_wire = exact(net_data['C_wire'] / 2.0)
+                d_net = [exact(net_data['R_wire']) * (half_wire + c_in) for c_in in self.c_in[i + 1]]
+
+            columns = max(len(c_out), len(d_net))
+            table = []
+            for choice in stage['choices']:
+                a = exact(choice['a'])
+                b = exact(choice['b'])
+                table.append([a * c_out[k if len(c_out) > 1 else 0] + b + d_net[k if len(d_net) > 1 else 0]
+                              for k in range(columns)])
+            self.delay.append(table)
+
+        timing = data['global_timing']
+        self.t_clk_q = exact(data['path_data']['fixed_delays']['T_clk_q'])
+        self.rat_setup = exact(timing['T_period'] - timing['T_setup'] - timing['T_skew'])
+        self.rat_hold = exact(timing['T_hold'] + timing['T_skew'])
+
+    def stage_delay(self, i, picks):
+        # picks: one choice index per stage
+        k = picks[i + 1] if i < len(picks) - 1 else 0
+        return self.delay[i][picks[i]][k]
+
+    def arrival(self, picks):
+        return self.t_clk_q + sum(self.stage_delay(i, picks) for i in range(len(picks)))
+
+    def slack_setup(self, picks):
+        return self.rat_setup - self.arrival(picks)
+
+    def slack_hold(self, picks):
+        return self.arrival(picks) - self.rat_hold
+
+    def total_area(self, picks):
+        return sum(self.area[i][j] for i, j in enumerate(picks))
+
+    def picks_for(self, cells):
+        # {slot_id: cell_type} (e.g. extract_buffers output) -> choice indices
+        return [self.choices[i].index(cells[slot_id]) for i, slot_id in enumerate(self.slot_ids)]
+
+    def cells_for(self, picks):
+        return {slot_id: self.choices[i][picks[i]] for i, slot_id in enumerate(self.slot_ids)}
+
+def write_solution(choices, note=None, path="buffers.sol"):
+    # {slot_id: cell_type} -> buffers.sol, one "inst cell" line per slot; the
+    # Tcl readers skip '#' lines, so a note can go on top
+    with open(path, "w") as f:
+        if note:
+            f.write(f"# {note}\n")
+        for slot, cell in sorted(choices.items()):
+            f.write(f"{slot} {cell}\n")
+
+# Multi-corner input (csvtojson.py on rows from --corners): each choice has
+# per-corner {"a", "b"} under "corners" and the input lists the corner names.
+# Everything else (nets, C_in, global timing) is shared by the corners.
+
+def has_corners(data):
+    paths = data['paths'] if 'paths' in data else [data]
+    return any(path.get('corners') for path in paths)
+
+def corner_input(data, corner):
+    # data as an ordinary solver input, with the a/b of one corner
+    stages = []
+    for stage in data['path_data']['stages']:
+        choices = []
+        for choice in stage['choices']:
+            fit = choice['corners'][corner]
+            choice = {key: value for key, value in choice.items() if key != 'corners'}
+            choice.update(a=fit['a'], b=fit['b'])
+            choices.append(choice)
+        stages.append(dict(stage, choices=choices))
+    single = {key: value for key, value in data.items() if key != 'corners'}
+    single['path_data'] = dict(data['path_data'], stages=stages)
+    return single
+
+def expand_corners(data):
+    # [(label, solver input)], one per corner of every path
+    paths = data['paths'] if 'paths' in data else [data]
+    expanded = []
+    for p, path_data in enumerate(paths):
+        prefix = f"path {p} @ " if 'paths' in data else ""
+        if not path_data.get('corners'):
+            expanded.append((f"path {p}", path_data))
+            continue
+        for corner in path_data['corners']:
+            expanded.append((prefix + corner, corner_input(path_data, corner)))
+    return expanded
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Run extraction straight into the SMT solver without intermediate files.
+
+The make flow writes critical_path_variants_reg.csv, re-reads it with pandas
+in csvtojson.py, writes solver_input.json and then re-reads that in main.py.
+This module builds the same solver input dict in memory from the build_rows()
+output and hands it to SMTsolver directly. The CSV and JSON are still written
+when --dump-dir is given, for debugging.
+
+With --paths-json (the critical_paths_data_reg.json written when extraction
+runs with SMT_PATH_COUNT=N) every path gets its own solver input and they are
+sized together by joint_solver.JointSolver.
+
+With --corners the rows are characterized at every listed corner and the
+solver input carries per-corner (a, b); corner_solver.CornerSolver then sizes
+for the worst corner.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from analyze_critical_path import LibertyDatabase, SpefParser, build_rows, load_json, write_csv
+from analyze_critical_path_reg import build_parser, extract_rows, load_sources
+from csvtojson import build_solver_input, split_columns
+
+# Row fields kept as text; every other field is numeric (None -> NaN, as when
+# pandas reads an empty CSV cell).
+TEXT_COLUMNS = ("instance_name", "original_cell", "variant_cell", "corner", "clock_period_ps_and_freq")
+
+
+def rows_to_columns(rows: Sequence[Dict[str, object]]) -> Dict[str, object]:
+    """Turn build_rows() output into column arrays, as read back from the CSV."""
+    columns: Dict[str, object] = {}
+    for name in rows[0]:
+        values = [row[name] for row in rows]
+        if name in TEXT_COLUMNS:
+            columns[name] = values
+        elif name == "gate_index":
+            columns[name] = np.asarray(values)
+        else:
+            columns[name] = np.array(values, dtype=float)
+    return columns
+
+
+def solver_input_from_rows(rows: Sequence[Dict[str, object]]) -> Dict[str, object]:
+    """Build the solver_input.json payload from build_rows() output."""
+    if not rows:
+        raise ValueError("No variant rows to build a solver input from.")
+    return build_solver_input(*split_columns(rows_to_columns(rows)))
+
+
+def solver_input_for_path(
+    summary: Dict[str, object],
+    stages: Sequence[Dict[str, object]],
+    libdb: LibertyDatabase,
+    spef: SpefParser,
+    corners: Optional[Dict[str, LibertyDatabase]] = None,
+) -> Dict[str, object]:
+    """Build the solver input for an extracted path (critical_path_data JSON)."""
+    return solver_input_from_rows(build_rows(summary, stages, libdb, spef, corners))
+
+
+def joint_input_for_paths(
+    paths: Sequence[Dict[str, object]],
+    libdb: LibertyDatabase,
+    spef: SpefParser,
+    corners: Optional[Dict[str, LibertyDatabase]] = None,
+) -> Dict[str, object]:
+    """Build the joint_solver input for several extracted paths (critical_paths_data_reg JSON)."""
+    return {"paths": [solver_input_for_path(path["summary"], path["stages"], libdb, spef, corners) for path in paths]}
+
+
+def extract_joint_input(args: argparse.Namespace) -> Dict[str, object]:
+    """Load the top-N paths JSON and build one solver input per path."""
+    if not args.paths_json.exists():
+        raise SystemExit(f"Critical paths JSON not found: {args.paths_json}")
+    paths = load_json(args.paths_json).get("paths")
+    if not isinstance(paths, list) or not paths:
+        raise SystemExit("Malformed critical paths JSON payload.")
+    libdb, spef, corners = load_sources(args, [stage for path in paths for stage in path["stages"]])
+    return joint_input_for_paths(paths, libdb, spef, corners)
+
+
+def dump_artifacts(rows: List[Dict[str, object]], data: Dict[str, object], dump_dir: Path) -> None:
+    """Write the CSV and JSON the file-based flow would have produced."""
+    write_csv(rows, dump_dir / "critical_path_variants_reg.csv")
+    with (dump_dir / "solver_input.json").open("w") as fh:
+        json.dump(data, fh, indent=2)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> bool:
+    parser = build_parser(__doc__)
+    parser.add_argument(
+        "--dump-dir",
+        type=Path,
+        default=None,
+        help="Also write critical_path_variants_reg.csv and solver_input.json here.",
+    )
+    parser.add_argument(
+        "--no-solve",
+        action="store_true",
+        help="Stop after building the solver input.",
+    )
+    parser.add_argument(
+        "--paths-json",
+        type=Path,
+        default=None,
+        help="Size the top-N paths in critical_paths_data_reg.json jointly (SMT_PATH_COUNT=N extraction).",
+    )
+    parser.add_argument(
+        "--objective",
+        choices=("worst", "total"),
+        default="worst",
+        help="Multi-path/multi-corner objective: worst setup slack or total negative slack.",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        help="Joint or multi-corner sizing: seconds per Z3 check before keeping the best solution so far.",
+    )
+    args = parser.parse_args(argv)
+    if args.paths_json is not None:
+        return solve_joint(args)
+    rows = extract_rows(args)
+    if not rows:
+        raise SystemExit("No variant rows generated.")
+    data = solver_input_from_rows(rows)
+    print(f"Built solver input for {len(data['path_data']['stages'])} stages from {len(rows)} rows")
+    if args.dump_dir is not None:
+        dump_artifacts(rows, data, args.dump_dir)
+        print(f"Wrote debug artifacts to {args.dump_dir}")
+    if args.no_solve:
+        return True
+
+    if data.get("corners"):
+        from corner_solver import CornerSolver
+
+        if not CornerSolver(data, objective=args.objective, timeout=args.timeout).solve():
+            print("No buffer assignment found for the worst corner.", file=sys.stderr)
+            return False
+        return True
+
+    # z3 is only needed once there is something to solve.
+    from solver import SMTsolver
+
+    if not SMTsolver(data).solve():
+        print("Unsatisfiable. No buffer combination meets timing.", file=sys.stderr)
+        return False
+    return True
+
+
+def solve_joint(args: argparse.Namespace) -> bool:
+    data = extract_joint_input(args)
+    print(f"Built joint solver input for {len(data['paths'])} paths")
+    if args.dump_dir is not None:
+        args.dump_dir.mkdir(parents=True, exist_ok=True)
+        with (args.dump_dir / "solver_input.json").open("w") as fh:
+            json.dump(data, fh, indent=2)
+        print(f"Wrote {args.dump_dir / 'solver_input.json'}")
+    if args.no_solve:
+        return True
+
+    from corner_solver import CornerSolver
+    from joint_solver import JointSolver
+    from path_model import has_corners
+
+    # Per-corner input: every (path, corner) pair is a path to the joint solver
+    solver_class = CornerSolver if has_corners(data) else JointSolver
+    if not solver_class(data, objective=args.objective, timeout=args.timeout).solve():
+        print("No joint buffer assignment found.", file=sys.stderr)
+        return False
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,178 @@
+import json
+import multiprocessing
+import pprint
+import queue
+import time
+
+from path_model import PathModel, write_solution
+
+# Portfolio solving: race several engine configurations on one path.
+#
+# One Optimize.check() can be slow on a particular path for a particular
+# encoding, and which one is slow is hard to tell up front. Each configuration
+# in CONFIGS runs in its own process on the same solver_input.json; the first
+# one to return a proven optimum wins and the others are killed. At the
+# deadline, the best assignment reported so far (Z3 hands back its last model
+# when it times out) is kept instead, and solve() says it is not proven.
+# Results are re-timed with PathModel, so engines are compared on exact slack,
+# not on what each one believes.
+#
+# Every race appends one JSON line to `log` with the winner and each engine's
+# status and time, so the configurations that never win can be dropped.
+# The DP finishes in milliseconds on a chain path and would end every race
+# before any Z3 configuration reports, so it only runs when asked for.
+
+CONFIGS = {
+    # name: engine (dp / z3) and, for z3, the SMTsolver encoding and Z3 params
+    "dp": {"engine": "dp"},
+    "z3-lra": {"engine": "z3", "encoding": "lra"},
+    "z3-pb": {"engine": "z3", "encoding": "pb"},
+    "z3-pb-arith2": {"engine": "z3", "encoding": "pb", "params": {"smt.arith.solver": 2}},
+    "z3-pb-seed1": {"engine": "z3", "encoding": "pb", "params": {"smt.random_seed": 1, "sat.random_seed": 1}},
+}
+
+DEFAULT_ENGINES = tuple(name for name in CONFIGS if name != "dp")
+
+# Seconds past the deadline to wait for engines reporting their last model
+GRACE = 2.0
+
+def run_config(name, data, deadline, results):
+    # Worker process: solve with one configuration, report
+    # (name, status, choices, seconds); choices is None without a model
+    start = time.perf_counter()
+    config = CONFIGS[name]
+    try:
+        if config["engine"] == "dp":
+            from dp_solver import DPsolver
+            inst = DPsolver(data)
+            results.put((name, "optimal", inst.extract_buffers(inst.optimize()), time.perf_counter() - start))
+            return
+
+        from z3 import set_param, sat, unknown
+        from solver import SMTsolver
+        for param, value in config.get("params", {}).items():
+            set_param(param, value)
+        inst = SMTsolver(data, encoding=config["encoding"])
+        inst.solver.set("timeout", max(int((deadline - (time.perf_counter() - start)) * 1000), 1))
+        result = inst.solver.check()
+        choices = None
+        if result == sat:
+            choices = inst.extract_buffers(inst.solver.model())
+        elif result == unknown:
+            # The last model at a timeout can leave slots unassigned; only a
+            # complete one is an answer PathModel can time
+            try:
+                choices = inst.extract_buffers(inst.solver.model())
+            except Exception:
+                pass
+            if choices is not None and len(choices) < len(inst.slot_ids):
+                choices = None
+        status = "optimal" if result == sat else str(result)
+        results.put((name, status, choices, time.perf_counter() - start))
+    except Exception as e:
+        results.put((name, f"error: {e}", None, time.perf_counter() - start))
+
+class PortfolioSolver:
+    def __init__(self, data, engines=DEFAULT_ENGINES, deadline=60.0, log="portfolio.jsonl"):
+        unknown_engines = [name for name in engines if name not in CONFIGS]
+        if unknown_engines:
+            raise ValueError(f"Unknown engine(s) {unknown_engines}, expected some of {tuple(CONFIGS)}")
+        if 'paths' in data:
+            raise ValueError("Portfolio mode sizes one path; use JointSolver for 'paths' input.")
+        self.data = data
+        self.engines = list(engines)
+        self.deadline = deadline
+        self.log = log
+        self.path = PathModel(data)
+        self.slot_ids = self.path.slot_ids
+        self.model = []
+        self.winner = None
+        self.proven = False
+        self.reports = {}
+
+    def slacks(self, choices):
+        picks = self.path.picks_for(choices)
+        return (self.path.slack_setup(picks), self.path.slack_hold(picks))
+
+    def race(self):
+        # Returns the winning {slot_id: cell_type}, or None if no engine had one
+        results = multiprocessing.Queue()
+        workers = {name: multiprocessing.Process(target=run_config, args=(name, self.data, self.deadline, results),
+                                                 daemon=True)
+                   for name in self.engines}
+        start = time.perf_counter()
+        for worker in workers.values():
+            worker.start()
+
+        best = None
+        try:
+            while len(self.reports) < len(workers):
+                remaining = self.deadline + GRACE - (time.perf_counter() - start)
+                try:
+                    name, status, choices, seconds = results.get(timeout=max(remaining, 0.0))
+                except queue.Empty:
+                    break
+                report = {"status": status, "seconds": round(seconds, 4)}
+                if choices is not None:
+                    setup, hold = self.slacks(choices)
+                    report.update(slack_setup=float(setup), slack_hold=float(hold))
+                    if status == "optimal":
+                        best = (name, choices)
+                        self.proven = True
+                        self.reports[name] = report
+                        break
+                    if best is None or self.slacks(choices) > self.slacks(best[1]):
+                        best = (name, choices)
+                self.reports[name] = report
+                print(f"  {name}: {status} after {seconds:.3f} s")
+        finally:
+            for name, worker in workers.items():
+                if worker.is_alive():
+                    worker.kill()
+                    self.reports.setdefault(name, {"status": "killed"})
+                worker.join()
+
+        if best is None:
+            return None
+        self.winner = best[0]
+        return best[1]
+
+    def write_log(self, seconds):
+        with open(self.log, "a") as f:
+            f.write(json.dumps({
+                "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "stages": len(self.slot_ids),
+                "deadline": self.deadline,
+                "winner": self.winner,
+                "proven": self.proven,
+                "seconds": round(seconds, 4),
+                "engines": self.reports,
+            }) + "\n")
+
+    def solve(self):
+        try:
+            print(f" ---- SOLVING (portfolio: {', '.join(self.engines)}; deadline {self.deadline} s) ---- ")
+            start = time.perf_counter()
+            choices = self.race()
+            seconds = time.perf_counter() - start
+            if self.log:
+                self.write_log(seconds)
+            if choices is None:
+                print("No engine found a solution before the deadline.")
+                return False
+
+            self.model = choices
+            print(f"Winner: {self.winner} after {seconds:.3f} s "
+                  f"({'proven optimal' if self.proven else 'best at the deadline, not proven'})")
+            setup, hold = self.slacks(choices)
+            print(f"slack_setup = {float(setup):.10f}, slack_hold = {float(hold):.10f}")
+
+            print("\nExtracted buffers:")
+            pprint.pprint(choices)
+
+            write_solution(choices)
+
+            return True
+
+        except Exception as e:
+            print(f"An error occurred: {e}")
@@ -12,6 +12,9 @@
 #   SDC_FILE      : timing constraints
 #   SPEF_FILE     : optional SPEF for parasitics
 #   LIB_FILES     : space-separated list of liberty files
+#   SMT_CORNERS   : optional PVT corners, e.g. "tt_025C_1v80 ss_100C_1v60";
+#                   one sky130_fd_sc_hd__<corner>.lib is read per corner and
+#                   the worst slacks are over all of them
 #
 #
 # -----------------------------
@@ -33,6 +36,14 @@ set spef_file    "../results/sky130hd/gcd/base/6_final.spef"
 set lib_files    "../platforms/sky130hd/lib/sky130_fd_sc_hd__tt_025C_1v80.lib"
 set tech_lefs    "../platforms/sky130hd/tech/sky130_fd_sc_hd.tlef"
 
+set corners [getenv_or_empty SMT_CORNERS]
+if {$corners ne ""} {
+    set lib_files {}
+    foreach corner $corners {
+        lappend lib_files "../platforms/sky130hd/lib/sky130_fd_sc_hd__${corner}.lib"
+    }
+}
+
 
 # You can either list specific LEFs or grab all of them:
 set cell_lefs [glob -nocomplain ../platforms/sky130hd/lef/*.lef]
@@ -76,8 +87,13 @@ puts "INFO: LEF_FILES     = $tech_lefs"
 # -----------------------------
 # 2. Read liberty file(s)
 # -----------------------------
+if {$corners ne ""} {
+    puts "INFO: define_corners $corners"
+    define_corners {*}$corners
+}
 if {$lib_files ne ""} {
-    foreach lib $lib_files {
+    # corner is "" for every lib unless SMT_CORNERS is set
+    foreach lib $lib_files corner $corners {
         set lib_trim [string trim $lib]
         if {$lib_trim eq ""} {
             continue
@@ -86,8 +102,13 @@ if {$lib_files ne ""} {
             puts "WARNING: Liberty file '$lib_trim' not found, skipping"
             continue
         }
-        puts "INFO: read_liberty $lib_trim"
-        read_liberty $lib_trim
+        if {$corner ne ""} {
+            puts "INFO: read_liberty -corner $corner $lib_trim"
+            read_liberty -corner $corner $lib_trim
+        } else {
+            puts "INFO: read_liberty $lib_trim"
+            read_liberty $lib_trim
+        }
     }
 }
 
@@ -0,0 +1,83 @@
+"""
+Content-addressed cache of solved solver inputs.
+
+The key is the SHA-256 of the solver input in canonical JSON form (sorted
+keys, no whitespace), so stages, choices, nets and global timing all count,
+but key order and formatting in the file do not, together with the solver
+mode (engine, encoding, objective). A rerun on an unchanged
+solver_input.json, or on one another run already solved, gets its
+buffers.sol and objective values back without running the solver.
+
+Only proven results are stored; a time-limited solve that stopped early
+always runs again. Entries are small JSON files. A hit refreshes the
+entry's mtime, and store() removes the least recently used entries beyond
+`max_entries`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Optional
+
+SOLVE_CACHE_VERSION = 1
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent / ".solve_cache"
+
+
+def canonical_key(data: Dict[str, object], mode: Dict[str, object]) -> str:
+    payload = {"version": SOLVE_CACHE_VERSION, "input": data, "mode": mode}
+    text = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class SolveCache:
+    """Directory of solve_<key>.json entries with LRU eviction."""
+
+    def __init__(self, cache_dir: Path = DEFAULT_CACHE_DIR, max_entries: int = 256) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max_entries
+
+    def entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"solve_{key}.json"
+
+    def load(self, data: Dict[str, object], mode: Dict[str, object]) -> Optional[Dict[str, object]]:
+        entry_path = self.entry_path(canonical_key(data, mode))
+        try:
+            with entry_path.open() as fh:
+                payload = json.load(fh)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(payload, dict) or payload.get("version") != SOLVE_CACHE_VERSION:
+            return None
+        try:
+            os.utime(entry_path)  # most recently used
+        except OSError:
+            pass
+        return payload
+
+    def store(self, data: Dict[str, object], mode: Dict[str, object], solution: str,
+              objectives: Dict[str, float]) -> None:
+        payload = {
+            "version": SOLVE_CACHE_VERSION,
+            "mode": mode,
+            "solution": solution,
+            "objectives": objectives,
+        }
+        entry_path = self.entry_path(canonical_key(data, mode))
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = entry_path.with_suffix(".tmp")
+            with tmp_path.open("w") as fh:
+                json.dump(payload, fh, indent=1)
+            tmp_path.replace(entry_path)
+            self.evict()
+        except OSError as exc:
+            print(f"[WARN] Could not write solve cache {entry_path}: {exc}", file=sys.stderr)
+
+    def evict(self) -> None:
+        entries = sorted(self.cache_dir.glob("solve_*.json"), key=lambda path: path.stat().st_mtime_ns)
+        for entry_path in entries[: max(len(entries) - self.max_entries, 0)]:
+            entry_path.unlink(missing_ok=True)
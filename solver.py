@@ -1,8 +1,95 @@
+from fractions import Fraction
 from z3 import *
+import json
 import pprint
+import time
+
+import flow_trace
+from path_model import PathModel, write_solution
+
+ENCODINGS = ("lra", "pb")
+
+def z3_const(value):
+    # PathModel keeps exact Fractions; hand them to Z3 as "num/den" numerals
+    return RealVal(str(value))
+
+def anytime_lex(assertions, objectives, time_budget, solver=None):
+    # Lexicographic optimum within time_budget seconds, by bound tightening.
+    #
+    # objectives: [(expr, 1 to maximize / -1 to minimize)], most important
+    # first, as handed to Optimize. A plain Solver is asked for any model and
+    # then, level by level, for a strictly better value of the current
+    # objective; unsat proves that level and fixes it for the next one. Every
+    # model found is feasible, so stopping at the budget still leaves the best
+    # one so far. Returns (model or None, proven). Pass solver to read its
+    # statistics() afterwards.
+    deadline = time.monotonic() + time_budget
+    if solver is None:
+        solver = Solver()
+    solver.add(assertions)
+    best = None
+    for expr, sense in objectives:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return best, False
+            solver.set("timeout", max(int(remaining * 1000), 1))
+            solver.push()
+            if best is not None:
+                value = best.eval(expr, model_completion=True)
+                solver.add(expr > value if sense > 0 else expr < value)
+            result = solver.check()
+            flow_trace.count("anytime_checks")
+            if result == sat:
+                best = solver.model()
+            solver.pop()
+            if result == unknown:
+                return best, False
+            if result == unsat:
+                if best is None:
+                    return None, True
+                solver.add(expr == best.eval(expr, model_completion=True))
+                break
+    return best, True
+
+def z3_number(value):
+    # float for numerals, str for what is not one (oo, epsilon terms)
+    if is_rational_value(value):
+        return float(value.as_fraction())
+    if is_algebraic_value(value):
+        return float(value.approx(10).as_fraction())
+    return str(value)
+
+def z3_statistics(statistics):
+    # Z3's counters (conflicts, decisions, memory, time, ...) as a dict
+    return {key: statistics.get_key_value(key) for key in statistics.keys()}
+
+def problem_size(assertions):
+    # Assertion count and the Bool / Real constants they use
+    seen = set()
+    variables = {}
+    stack = list(assertions)
+    while stack:
+        expr = stack.pop()
+        if expr.get_id() in seen:
+            continue
+        seen.add(expr.get_id())
+        if is_const(expr) and expr.decl().kind() == Z3_OP_UNINTERPRETED:
+            sort = expr.sort().name()
+            variables[sort] = variables.get(sort, 0) + 1
+        else:
+            stack.extend(expr.children())
+    return {
+        "assertions": len(assertions),
+        "bool_vars": variables.get("Bool", 0),
+        "real_vars": variables.get("Real", 0),
+    }
 
 class SMTsolver:
-    def __init__(self, data):
+    def __init__(self, data, encoding="lra", sta_feedback=False):
+        if encoding not in ENCODINGS:
+            raise ValueError(f"Unknown encoding '{encoding}', expected one of {ENCODINGS}")
+        self.encoding = encoding
         self.stages = data['path_data']['stages']
 
         self.slot_ids = []
@@ -12,8 +99,11 @@ class SMTsolver:
         # print("Slot ids: " + str(self.slot_ids))
 
         # Instantiate PyZ3 solver
+        build_start = time.perf_counter()
         self.solver = Optimize()
         self.model = []
+        self.proven = False
+        self.stats = None
 
         # --- BASIC CONSTRAINTS ---
         # Construct boolean decision vars: dictionary of (slot_id, cell): z3_var pairs
@@ -25,6 +115,34 @@ class SMTsolver:
                     self.decision_vars[(slot['slot_id'], cell_name)] = Bool(f"S_{slot['slot_id']}_{cell_name}")
         # print("Decision vars: ", str(self.decision_vars))
 
+        with flow_trace.phase("smt_build"):
+            if encoding == "pb":
+                self.encode_pb(data)
+            else:
+                self.encode_lra(data)
+        if flow_trace.enabled():
+            flow_trace.count("decision_vars", len(self.decision_vars))
+            flow_trace.count("assertions", len(self.solver.assertions()))
+
+        # Both encodings name their slack variables the same way
+        self.slack_setup = Real("slack_setup")
+        self.slack_hold = Real("slack_hold")
+
+        if sta_feedback:
+            # Closed loop: what STA measured for an assignment can only lower
+            # its slack, through penalties that add_sta_feedback() bounds for
+            # that assignment. Maximizing keeps every other one at zero.
+            self.setup_penalty = Real("setup_penalty")
+            self.hold_penalty = Real("hold_penalty")
+            self.solver.add(self.setup_penalty >= 0, self.hold_penalty >= 0)
+            self.objectives = [(self.slack_setup - self.setup_penalty, 1), (self.slack_hold - self.hold_penalty, 1)]
+        else:
+            self.objectives = [(self.slack_setup, 1), (self.slack_hold, 1)]
+        # Optimize handles, for the bounds Z3 reaches on each objective
+        self.handles = [self.solver.maximize(expr) for expr, _ in self.objectives]
+        self.build_time = time.perf_counter() - build_start
+
+    def encode_lra(self, data):
         # One-hot constraints: at least one cell per slot, but no more
         for slot in self.stages:
             slot_id = slot['slot_id']
@@ -139,11 +257,43 @@ class SMTsolver:
         # slack_hold = AT_min - RAT_hold
         self.solver.add(slack_hold == AT - RAT_hold)
 
-        # Enforce non-negative slack => timing-legal
-        self.solver.maximize(slack_setup)
-        self.solver.maximize(slack_hold)
-            
-    def solve(self):
+
+    def encode_pb(self, data):
+        # Same objectives as encode_lra, without real-valued C_in/C_out: a
+        # stage's delay is a constant for each (choice_i, choice_i+1) pair, so
+        # it is bounded from below by whichever pair is picked. Minimizing the
+        # arrival time pulls every D_stage down onto its pair constant.
+        self.path = PathModel(data)
+        picks = [[self.decision_vars[(slot_id, cell)] for cell in self.path.choices[i]]
+                 for i, slot_id in enumerate(self.path.slot_ids)]
+
+        # One-hot constraints as pseudo-boolean equalities
+        for stage_vars in picks:
+            self.solver.add(PbEq([(var, 1) for var in stage_vars], 1))
+
+        # Pairwise delay constants: D_stage_i >= delay[i][j][k] if j and k are picked
+        D_stage = {slot: Real(f"D_stage_{slot}") for slot in self.slot_ids}
+        last = len(picks) - 1
+        for i, table in enumerate(self.path.delay):
+            D = D_stage[self.slot_ids[i]]
+            self.solver.add(D >= z3_const(min(min(row) for row in table)))
+            for j, row in enumerate(table):
+                for k, delay in enumerate(row):
+                    chosen = And(picks[i][j], picks[i + 1][k]) if i < last else picks[i][j]
+                    self.solver.add(Implies(chosen, D >= z3_const(delay)))
+
+        AT = Real("AT")
+        self.solver.add(AT == z3_const(self.path.t_clk_q) + Sum([D_stage[slot] for slot in self.slot_ids]))
+
+        slack_setup = Real("slack_setup")
+        slack_hold = Real("slack_hold")
+        self.solver.add(slack_setup == z3_const(self.path.rat_setup) - AT)
+        self.solver.add(slack_hold == AT - z3_const(self.path.rat_hold))
+
+    def solve(self, time_budget=None):
+        if time_budget is not None:
+            return self.solve_anytime(time_budget)
+
         # print("\nPrinting all constraints:")
         set_option(rational_to_decimal=True)
         set_option(precision=10)
@@ -152,21 +302,22 @@ class SMTsolver:
 
         try:
             print(" ---- SOLVING ---- ")
-            result = self.solver.check()
+            check_start = time.perf_counter()
+            with flow_trace.phase("smt_check"):
+                result = self.solver.check()
+            self.collect_stats(result, time.perf_counter() - check_start, self.solver)
             if result == sat:
                 print("Found a valid solution!")
                 self.model = self.solver.model()
+                self.proven = True
                 choices = self.extract_buffers(self.model)
                 nicer = sorted([(d, self.model[d]) for d in self.model], key = lambda x: str(x[0]))
                 # pprint.pprint(nicer)
 
                 print("\nExtracted buffers:")
                 pprint.pprint(choices)
-                
-                with open("buffers.sol", "w") as f:
-                    for slot, cell in sorted(choices.items()):
-                        f.write(f"{slot} {cell}\n")
-                        
+
+                write_solution(choices)
                 return True
             else:
                 return False
@@ -174,6 +325,98 @@ class SMTsolver:
         except Exception as e:
             print(f"An error occurred: {e}")
 
+    def solve_anytime(self, time_budget):
+        # Best assignment found within time_budget seconds. buffers.sol is
+        # written with a note saying whether it is proven optimal. False if
+        # the constraints are unsatisfiable, or if no model was found in time
+        # and the conflict cuts added so far rule out the fallback.
+        set_option(rational_to_decimal=True)
+        set_option(precision=10)
+        print(f" ---- SOLVING (time budget {time_budget} s) ---- ")
+        solver = Solver()
+        check_start = time.perf_counter()
+        try:
+            with flow_trace.phase("smt_anytime"):
+                model, proven = anytime_lex(self.solver.assertions(), self.objectives, time_budget, solver)
+        except Exception as e:
+            print(f"An error occurred: {e}")
+            model, proven = None, False
+        result = "sat" if model is not None else ("unsat" if proven else "unknown")
+        self.collect_stats(result, time.perf_counter() - check_start, solver, model, proven)
+
+        if model is None and proven:
+            return False
+        if model is None:
+            # Fall back to the first choice of every slot. A plain one-hot
+            # assignment is always feasible, but the cuts add_conflict adds
+            # (closed_loop.py --feedback block) can exclude it, so it is checked
+            # against the current assertions; with every Bool fixed that check
+            # is quick.
+            first = [self.decision_vars[(stage['slot_id'], stage['choices'][0]['cell_type'])]
+                     for stage in self.stages]
+            fallback = Solver()
+            fallback.add(self.solver.assertions())
+            fallback.set("timeout", 1000)
+            if fallback.check(first) != sat:
+                print(f"No model within {time_budget} s and the current constraints exclude "
+                      "the first-choice fallback; buffers.sol not written.")
+                return False
+            choices = self.extract_buffers(fallback.model())
+            note = f"no model within {time_budget} s; first choice per slot, not proven optimal"
+        else:
+            self.model = model
+            choices = self.extract_buffers(model)
+            note = "proven optimal" if proven else f"best found within {time_budget} s, not proven optimal"
+            print(f"slack_setup = {float(model.eval(self.slack_setup).as_fraction()):.10f}, "
+                  f"slack_hold = {float(model.eval(self.slack_hold).as_fraction()):.10f}")
+        self.proven = proven
+        print(f"Solution: {note}")
+
+        print("\nExtracted buffers:")
+        pprint.pprint(choices)
+
+        write_solution(choices, note)
+        return True
+
+    def collect_stats(self, result, check_time, solver, model=None, proven=None):
+        # self.stats: problem size, Z3 statistics and where each objective
+        # ended up. Optimize reports [lower, upper] per objective; the anytime
+        # search only knows the value of its best model, which is the upper
+        # bound too once proven.
+        objectives = []
+        for i, (expr, _) in enumerate(self.objectives):
+            entry = {"name": str(expr), "value": None, "lower": None, "upper": None}
+            if solver is self.solver:
+                # Optimize keeps its bounds after unknown as well
+                handle = self.handles[i]
+                entry.update(lower=z3_number(handle.lower()), upper=z3_number(handle.upper()))
+                if str(result) == "sat":
+                    entry["value"] = z3_number(handle.value())
+            elif model is not None:
+                value = z3_number(model.eval(expr, model_completion=True))
+                entry.update(value=value, lower=value, upper=value if proven else None)
+            objectives.append(entry)
+
+        self.stats = {
+            "encoding": self.encoding,
+            "result": str(result),
+            "proven": str(result) == "sat" if proven is None else proven,
+            "stages": len(self.slot_ids),
+            "choices_per_stage": [len(stage['choices']) for stage in self.stages],
+            "decision_vars": len(self.decision_vars),
+            **problem_size(self.solver.assertions()),
+            "build_s": round(self.build_time, 6),
+            "check_s": round(check_time, 6),
+            "objectives": objectives,
+            "z3": z3_statistics(solver.statistics()),
+        }
+        return self.stats
+
+    def write_stats(self, path):
+        # JSON copy of self.stats, after solve()
+        with open(path, "w") as f:
+            json.dump(self.stats, f, indent=1)
+
     def extract_buffers(self, model):
         choices = {}
         for (slot_id, cell_name), z3_var in self.decision_vars.items():
@@ -193,4 +436,18 @@ class SMTsolver:
             return  
         
         clause = Or([Not(v) for v in true_vars])
-        self.solver.add(clause)
\ No newline at end of file
+        self.solver.add(clause)
+
+
+    def add_sta_feedback(self, model, setup, hold):
+        # Needs sta_feedback=True. Corrects the assignment in model to the
+        # slacks STA measured for it; the cut stays for later check() calls.
+        true_vars = [var for var in self.decision_vars.values() if is_true(model[var])]
+        if not true_vars:
+            return
+
+        predicted_setup = model.eval(self.slack_setup).as_fraction()
+        predicted_hold = model.eval(self.slack_hold).as_fraction()
+        chosen = And(true_vars)
+        self.solver.add(Implies(chosen, self.setup_penalty >= z3_const(predicted_setup - Fraction(str(setup)))))
+        self.solver.add(Implies(chosen, self.hold_penalty >= z3_const(predicted_hold - Fraction(str(hold)))))
@@ -1,8 +1,15 @@
 from z3 import *
 import pprint
 
+import flow_trace
+from solver import anytime_lex, write_solution
+
 class SMTsolver:
     def __init__(self, data):
+        with flow_trace.phase("ppa_build"):
+            self.encode(data)
+
+    def encode(self, data):
         self.stages = data['path_data']['stages']
 
         self.slot_ids = []
@@ -151,14 +158,16 @@ class SMTsolver:
         # slack_hold = AT_min - RAT_hold
         self.solver.add(slack_hold == AT - RAT_hold)
 
-        # Optimize slack
+        # Optimize slack, then area
+        self.objectives = [(slack_setup, 1), (slack_hold, 1), (total_area, -1)]
         self.solver.maximize(slack_setup)
         self.solver.maximize(slack_hold)
-
-        # Optimize area
         self.solver.minimize(total_area)
             
-    def solve(self):
+    def solve(self, time_budget=None):
+        if time_budget is not None:
+            return self.solve_anytime(time_budget)
+
         print("\nPrinting all constraints:")
         set_option(rational_to_decimal=True)
         set_option(precision=10)
@@ -167,7 +176,8 @@ class SMTsolver:
 
         try:
             print(" ---- SOLVING ---- ")
-            result = self.solver.check()
+            with flow_trace.phase("ppa_check"):
+                result = self.solver.check()
             if result == sat:
                 print("Found a valid solution!")
                 self.model = self.solver.model()
@@ -178,10 +188,8 @@ class SMTsolver:
                 print("\nExtracted buffers:")
                 pprint.pprint(choices)
                 
-                with open("buffers.sol", "w") as f:
-                    for slot, cell in sorted(choices.items()):
-                        f.write(f"{slot} {cell}\n")
-                        
+                write_solution(choices)
+
                 return True
             else:
                 return False
@@ -189,6 +197,34 @@ class SMTsolver:
         except Exception as e:
             print(f"An error occurred: {e}")
 
+    def solve_anytime(self, time_budget):
+        # As SMTsolver.solve_anytime: always writes buffers.sol, noting
+        # whether the result is proven optimal
+        print(f" ---- SOLVING (time budget {time_budget} s) ---- ")
+        try:
+            with flow_trace.phase("ppa_anytime"):
+                model, proven = anytime_lex(self.solver.assertions(), self.objectives, time_budget)
+        except Exception as e:
+            print(f"An error occurred: {e}")
+            model, proven = None, False
+
+        if model is None and proven:
+            return False
+        if model is None:
+            choices = {stage['slot_id']: stage['choices'][0]['cell_type'] for stage in self.stages}
+            note = f"no model within {time_budget} s; first choice per slot, not proven optimal"
+        else:
+            self.model = model
+            choices = self.extract_buffers(model)
+            note = "proven optimal" if proven else f"best found within {time_budget} s, not proven optimal"
+        print(f"Solution: {note}")
+
+        print("\nExtracted buffers:")
+        pprint.pprint(choices)
+
+        write_solution(choices, note)
+        return True
+
     def extract_buffers(self, model):
         choices = {}
         for (slot_id, cell_name), z3_var in self.decision_vars.items():
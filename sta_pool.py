@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Pool of persistent STA sessions that check several candidates at once.
+
+Each worker is an STASession (sta_session.py), so every OpenROAD process
+loads the design once through setup_sta.tcl and keeps it. evaluate_many()
+hands the buffers.sol files out to the idle workers and returns the
+measured (setup, hold) slack of each, in input order; best() picks the one
+STA likes most (timing met first, then setup, then hold, as
+ClosedLoop.best() ranks them). The sessions are driven from threads, which
+only wait on OpenROAD's pipes, so the checks run on as many cores as
+there are workers.
+
+    python3 sta_pool.py --workers 4 a.sol b.sol c.sol d.sol
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+
+from sta_session import OPENROAD, SETUP_TCL, STASession
+
+
+def rank(slacks: Tuple[float, float]) -> Tuple[bool, float, float]:
+    setup, hold = slacks
+    return (min(setup, hold) >= 0, setup, hold)
+
+
+class STAPool:
+    def __init__(
+        self,
+        workers: int = 0,
+        openroad: str = OPENROAD,
+        setup_file: str = SETUP_TCL,
+        timeout: float = 300.0,
+        setup_timeout: float = 1800.0,
+    ) -> None:
+        # 0 workers: one per core
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = ThreadPoolExecutor(max_workers=self.workers)
+        # Sessions start in parallel too; each loads its own copy of the design
+        start = time.perf_counter()
+        futures = [
+            self.executor.submit(STASession, openroad, setup_file, timeout, setup_timeout)
+            for _ in range(self.workers)
+        ]
+        self.sessions: List[STASession] = []
+        try:
+            for future in futures:
+                self.sessions.append(future.result())
+        except Exception:
+            self.close()
+            raise
+        self.load_time = time.perf_counter() - start
+        self.idle: "queue.Queue[STASession]" = queue.Queue()
+        for session in self.sessions:
+            self.idle.put(session)
+
+    def evaluate(self, solution_file: str) -> Tuple[float, float]:
+        """Check one buffers.sol on whichever worker is free."""
+        session = self.idle.get()
+        try:
+            return session.evaluate(solution_file)
+        finally:
+            self.idle.put(session)
+
+    __call__ = evaluate
+
+    def evaluate_many(self, solution_files: Sequence[str]) -> List[Tuple[float, float]]:
+        """(setup, hold) slack of every file, in order; the checks run concurrently."""
+        return list(self.executor.map(self.evaluate, solution_files))
+
+    def best(self, solution_files: Sequence[str]) -> Tuple[int, Tuple[float, float]]:
+        """Index and slacks of the candidate STA ranks highest."""
+        results = self.evaluate_many(solution_files)
+        index = max(range(len(results)), key=lambda i: rank(results[i]))
+        return index, results[index]
+
+    def close(self) -> None:
+        for session in self.sessions:
+            session.stop()
+        self.executor.shutdown(wait=True)
+
+    def __enter__(self) -> "STAPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("solutions", nargs="+", help="buffers.sol files to check.")
+    parser.add_argument("--workers", type=int, default=0, help="OpenROAD processes (default: one per core).")
+    parser.add_argument("--openroad", default=OPENROAD, help="OpenROAD binary (or a stand-in command).")
+    parser.add_argument("--setup", default=SETUP_TCL, help="Tcl script that loads the design.")
+    parser.add_argument("--timeout", type=float, default=300.0, help="Seconds to wait for each command.")
+    args = parser.parse_args(argv)
+
+    workers = min(args.workers or os.cpu_count() or 1, len(args.solutions))
+    with STAPool(workers, args.openroad, args.setup, timeout=args.timeout) as pool:
+        print(f"{pool.workers} workers loaded the design in {pool.load_time:.2f} s")
+        start = time.perf_counter()
+        results = pool.evaluate_many(args.solutions)
+        elapsed = time.perf_counter() - start
+    for solution, (setup, hold) in zip(args.solutions, results):
+        print(f"{solution}: setup {setup:.4f} hold {hold:.4f}")
+    best = max(range(len(results)), key=lambda i: rank(results[i]))
+    print(f"Best: {args.solutions[best]} ({elapsed:.3f} s for {len(results)} candidates)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Long-lived OpenROAD/STA process for checking buffer solutions in the loop.
+
+main.py and closed_loop.py's one-shot evaluator start a fresh OpenROAD for
+every candidate, re-reading the LEFs, netlist and liberty each time. An
+STASession starts OpenROAD once, sources setup_sta.tcl to load the design,
+and then only sends `apply_buffer_solution` / `compute_worst_slacks` per
+candidate (the procs setup_sta.tcl defines; archive/STAController.py was the
+first sketch of this).
+
+Each command is wrapped in `catch` and followed by a unique sentinel line, so
+the reply to a command is exactly the lines before its sentinel, and a Tcl
+error comes back as an STAError instead of a hang. A reply that does not
+arrive within the timeout kills the process (STATimeout). If OpenROAD dies,
+the next evaluate() restarts it, reloads the design and retries once.
+apply_buffer_solution sets every listed instance, so a restarted session
+gives the same answer.
+
+fake_sta.py speaks the same protocol and can stand in for OpenROAD:
+
+    python3 sta_session.py --openroad "python3 fake_sta.py" buffers.sol
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import queue
+import shlex
+import subprocess
+import sys
+import threading
+import time
+from typing import List, Optional, Sequence, Tuple
+
+OPENROAD = "../../tools/install/OpenROAD/bin/openroad"
+SETUP_TCL = "setup_sta.tcl"
+DONE = "__SMT_DONE__"
+ERROR = "__SMT_ERROR__"
+
+
+class STAError(RuntimeError):
+    """A command failed inside OpenROAD, or OpenROAD exited."""
+
+
+class STATimeout(STAError):
+    """OpenROAD did not answer within the timeout and was killed."""
+
+
+def parse_worst_slacks(lines: Sequence[str]) -> Tuple[float, float]:
+    """Read setup/hold slack from compute_worst_slacks output (setup_sta.tcl)."""
+    setup = hold = None
+    for line in lines:
+        line = line.strip()
+        if line.startswith("worst slack max"):
+            setup = float(line.split()[-1])
+        elif line.startswith("worst slack min"):
+            hold = float(line.split()[-1])
+    if setup is None or hold is None:
+        raise STAError("STA output has no 'worst slack max/min' lines")
+    return setup, hold
+
+
+class STASession:
+    def __init__(
+        self,
+        openroad: str = OPENROAD,
+        setup_file: str = SETUP_TCL,
+        timeout: float = 300.0,
+        setup_timeout: float = 1800.0,
+        restarts: int = 2,
+        echo: bool = False,
+    ) -> None:
+        # openroad may carry arguments (e.g. "python3 fake_sta.py")
+        self.command = shlex.split(openroad) + ["-no_init"]
+        self.setup_file = setup_file
+        self.timeout = timeout
+        self.setup_timeout = setup_timeout
+        self.restarts = restarts
+        self.echo = echo
+        self.proc: Optional[subprocess.Popen] = None
+        self.lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        self.sequence = itertools.count()
+        self.starts = 0
+        self.load_time = 0.0
+        self.start()
+
+    def start(self) -> None:
+        """Start OpenROAD and load the design through setup_file."""
+        self.stop()
+        self.proc = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,
+        )
+        self.lines = queue.Queue()
+        reader = threading.Thread(target=self._read, args=(self.proc, self.lines), daemon=True)
+        reader.start()
+        self.starts += 1
+        start = time.perf_counter()
+        self.run(f"source {self.setup_file}", timeout=self.setup_timeout)
+        self.load_time = time.perf_counter() - start
+
+    def _read(self, proc: subprocess.Popen, lines: "queue.Queue[Optional[str]]") -> None:
+        for line in proc.stdout:
+            lines.put(line.rstrip("\n"))
+        lines.put(None)  # EOF: the process is gone
+
+    def alive(self) -> bool:
+        return self.proc is not None and self.proc.poll() is None
+
+    def run(self, command: str, timeout: Optional[float] = None) -> List[str]:
+        """Send one Tcl command and return the lines it printed."""
+        if not self.alive():
+            raise STAError("OpenROAD is not running")
+        seq = next(self.sequence)
+        sentinel = f"{DONE} {seq}"
+        try:
+            self.proc.stdin.write(
+                f"if {{[catch {{{command}}} smt_err]}} {{ puts \"{ERROR} $smt_err\" }}\n"
+                f"puts \"{sentinel}\"\n"
+                "flush stdout\n"
+            )
+            self.proc.stdin.flush()
+        except (BrokenPipeError, OSError) as exc:
+            raise STAError(f"OpenROAD exited before '{command}'") from exc
+
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        output: List[str] = []
+        error: Optional[str] = None
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                line = self.lines.get(timeout=max(remaining, 0.0))
+            except queue.Empty:
+                self.kill()
+                raise STATimeout(f"No reply to '{command}' within {self.timeout if timeout is None else timeout} s")
+            if line is None:
+                raise STAError(f"OpenROAD exited during '{command}' (code {self.proc.wait()})")
+            if self.echo:
+                print("[STA]", line)
+            if line == sentinel:
+                break
+            if line.startswith(ERROR):
+                # Raised once the sentinel is read, so it cannot leak into the next reply
+                error = line[len(ERROR):].strip()
+                continue
+            output.append(line)
+        if error is not None:
+            raise STAError(f"'{command}' failed: {error}")
+        return output
+
+    def evaluate(self, solution_file: str = "buffers.sol") -> Tuple[float, float]:
+        """Apply a buffers.sol and return (setup, hold) worst slack."""
+        for attempt in range(self.restarts + 1):
+            try:
+                if not self.alive():
+                    self.start()
+                self.run(f"apply_buffer_solution {{{solution_file}}}")
+                return parse_worst_slacks(self.run("compute_worst_slacks"))
+            except STAError as exc:
+                if self.alive() or attempt == self.restarts:
+                    raise
+                print(f"[WARN] {exc}; restarting OpenROAD", file=sys.stderr)
+        raise STAError("unreachable")
+
+    __call__ = evaluate
+
+    def kill(self) -> None:
+        if self.proc is not None and self.proc.poll() is None:
+            self.proc.kill()
+            self.proc.wait()
+
+    def stop(self) -> None:
+        """Ask OpenROAD to exit, killing it if it does not."""
+        if self.proc is None:
+            return
+        if self.proc.poll() is None:
+            try:
+                self.proc.stdin.write("exit\n")
+                self.proc.stdin.flush()
+                self.proc.wait(timeout=10)
+            except (BrokenPipeError, OSError, subprocess.TimeoutExpired):
+                self.kill()
+        self.proc = None
+
+    close = stop
+
+    def __enter__(self) -> "STASession":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("solutions", nargs="+", help="buffers.sol files to check in one session.")
+    parser.add_argument("--openroad", default=OPENROAD, help="OpenROAD binary (or a stand-in command).")
+    parser.add_argument("--setup", default=SETUP_TCL, help="Tcl script that loads the design.")
+    parser.add_argument("--timeout", type=float, default=300.0, help="Seconds to wait for each command.")
+    args = parser.parse_args(argv)
+
+    with STASession(args.openroad, args.setup, timeout=args.timeout) as session:
+        print(f"Design loaded in {session.load_time:.2f} s")
+        for solution in args.solutions:
+            start = time.perf_counter()
+            setup, hold = session.evaluate(solution)
+            print(f"{solution}: setup {setup:.4f} hold {hold:.4f} ({time.perf_counter() - start:.3f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+import json
+
+import pytest
+
+from conftest import ROOT
+from dp_solver import DPsolver
+from path_model import PathModel
+from solver import SMTsolver
+
+# lra takes minutes on the 12-stage example, so it is only run on the small one
+CASES = [
+    ("example/solver_input.json", "pb"),
+    ("archive/new_example.json", "pb"),
+    ("archive/new_example.json", "lra"),
+]
+
+
+@pytest.mark.parametrize("input_file, encoding", CASES)
+def test_dp_matches_smtsolver(input_file, encoding):
+    with (ROOT / input_file).open() as fh:
+        data = json.load(fh)
+    path = PathModel(data)
+
+    dp = DPsolver(data)
+    dp_setup = path.slack_setup(dp.optimize())
+
+    inst = SMTsolver(data, encoding=encoding)
+    assert str(inst.solver.check()) == "sat"
+    model = inst.solver.model()
+    z3_setup = model.eval(inst.slack_setup).as_fraction()
+
+    # Exact: PathModel builds its constants the way the Z3 encodings do
+    assert dp_setup == z3_setup
+    assert path.slack_setup(path.picks_for(inst.extract_buffers(model))) == z3_setup
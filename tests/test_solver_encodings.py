@@ -0,0 +1,21 @@
+import json
+
+from conftest import ROOT
+from solver import SMTsolver
+
+
+def solve(data, encoding):
+    inst = SMTsolver(data, encoding=encoding)
+    assert str(inst.solver.check()) == "sat"
+    model = inst.solver.model()
+    slacks = (model.eval(inst.slack_setup).as_fraction(), model.eval(inst.slack_hold).as_fraction())
+    return slacks, inst.extract_buffers(model)
+
+
+def test_pb_matches_lra():
+    with (ROOT / "archive" / "new_example.json").open() as fh:
+        data = json.load(fh)
+    lra_slacks, lra_cells = solve(data, "lra")
+    pb_slacks, pb_cells = solve(data, "pb")
+    assert pb_slacks == lra_slacks
+    assert pb_cells == lra_cells
@@ -0,0 +1,64 @@
+import json
+import sys
+
+import pytest
+
+from conftest import ROOT
+from path_model import PathModel
+from sta_session import STAError, STASession, STATimeout
+
+INPUT = ROOT / "example" / "solver_input.json"
+FAKE_STA = f"{sys.executable} {ROOT / 'fake_sta.py'}"
+
+
+@pytest.fixture
+def solution(tmp_path, monkeypatch):
+    """A buffers.sol picking each stage's last choice, and its expected (setup, hold)."""
+    monkeypatch.setenv("FAKE_STA_INPUT", str(INPUT))
+    with INPUT.open() as fh:
+        path = PathModel(json.load(fh))
+    picks = [len(choices) - 1 for choices in path.choices]
+    sol = tmp_path / "buffers.sol"
+    sol.write_text("".join(f"{slot} {cell}\n" for slot, cell in path.cells_for(picks).items()))
+    expected = (round(float(path.slack_setup(picks)), 4), round(float(path.slack_hold(picks)), 4))
+    return str(sol), expected
+
+
+def test_evaluate(solution):
+    sol, expected = solution
+    with STASession(FAKE_STA, timeout=10) as session:
+        assert session.evaluate(sol) == pytest.approx(expected)
+        assert session.evaluate(sol) == pytest.approx(expected)
+        assert session.starts == 1
+
+
+def test_error_reply_keeps_framing(solution):
+    sol, expected = solution
+    with STASession(FAKE_STA, timeout=10) as session:
+        with pytest.raises(STAError, match="bogus_cmd"):
+            session.run("bogus_cmd")
+        # The failed command's sentinel must not show up in the next reply
+        applied = session.run(f"apply_buffer_solution {{{sol}}}")
+        assert applied and all(line.startswith("INFO: replaced") for line in applied)
+        assert session.run("compute_worst_slacks") == [
+            f"worst slack max {expected[0]:.4f}",
+            f"worst slack min {expected[1]:.4f}",
+        ]
+
+
+def test_timeout_kills_process(solution, monkeypatch):
+    monkeypatch.setenv("FAKE_STA_HANG_AFTER", "1")
+    with STASession(FAKE_STA, timeout=0.5) as session:
+        with pytest.raises(STATimeout):
+            session.run("compute_worst_slacks")
+        assert not session.alive()
+
+
+def test_restart_after_crash(solution, monkeypatch):
+    sol, expected = solution
+    # Each process crashes on its second check; the restarted one answers the retry
+    monkeypatch.setenv("FAKE_STA_CRASH_AFTER", "2")
+    with STASession(FAKE_STA, timeout=10) as session:
+        assert session.evaluate(sol) == pytest.approx(expected)
+        assert session.evaluate(sol) == pytest.approx(expected)
+        assert session.starts == 2